@@ -0,0 +1,146 @@
+"""
+Persistência opcional do cache em SQLite.
+
+O cache em memória continua sendo a fonte primária (rápido e com semântica
+LRU); este módulo só espelha as entradas em disco para que sobrevivam a
+restarts do processo. Habilitado quando a env var CACHE_DB_PATH está definida.
+"""
+
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    table_name TEXT NOT NULL,
+    cache_key TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    saved_at REAL NOT NULL,
+    PRIMARY KEY (table_name, cache_key)
+)
+"""
+
+
+class SQLiteCacheStore:
+    """Write-through mirror for the in-memory caches, backed by SQLite."""
+
+    def __init__(self, db_path: str):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(_SCHEMA)
+        self._conn.commit()
+
+    def load(self, table_name: str, max_age_seconds: float) -> Dict[str, Dict[str, Any]]:
+        """Load non-expired entries for a table, oldest first (LRU-friendly order)."""
+        cutoff = time.time() - max_age_seconds
+        rows = self._conn.execute(
+            "SELECT cache_key, payload, saved_at FROM cache_entries"
+            " WHERE table_name = ? AND saved_at > ? ORDER BY saved_at",
+            (table_name, cutoff),
+        ).fetchall()
+        entries = {}
+        for cache_key, payload, saved_at in rows:
+            try:
+                data = json.loads(payload)
+            except ValueError:
+                continue
+            data["cached_at"] = saved_at
+            entries[cache_key] = data
+        return entries
+
+    def set(self, table_name: str, cache_key: str, payload: Dict[str, Any]):
+        serializable = {k: v for k, v in payload.items() if isinstance(v, (str, int, float, list))}
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache_entries (table_name, cache_key, payload, saved_at)"
+            " VALUES (?, ?, ?, ?)",
+            (table_name, cache_key, json.dumps(serializable), time.time()),
+        )
+        self._conn.commit()
+
+    def delete(self, table_name: str, cache_key: str):
+        self._conn.execute(
+            "DELETE FROM cache_entries WHERE table_name = ? AND cache_key = ?",
+            (table_name, cache_key),
+        )
+        self._conn.commit()
+
+    def clear(self):
+        self._conn.execute("DELETE FROM cache_entries")
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+def open_store_from_env() -> Optional[SQLiteCacheStore]:
+    """Open the persistent store if CACHE_DB_PATH is configured, else None."""
+    db_path = os.getenv("CACHE_DB_PATH")
+    if not db_path:
+        return None
+    return SQLiteCacheStore(db_path)
+
+
+_RESPONSE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_responses (
+    cache_key TEXT PRIMARY KEY,
+    content TEXT NOT NULL,
+    saved_at REAL NOT NULL
+)
+"""
+
+
+class ResponseCache:
+    """Cache content-addressed de respostas LLM, em SQLite.
+
+    Tradução/resumo são determinísticos o bastante (temperature baixa) para
+    que repetir o mesmo prompt no mesmo modelo valha um acerto local: um hit
+    elimina a latência da requisição e o custo de tokens inteiro.
+    """
+
+    def __init__(self, db_path: str, ttl_seconds: float = 30 * 86400):
+        directory = os.path.dirname(db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute(_RESPONSE_SCHEMA)
+        self._conn.commit()
+        self._ttl = ttl_seconds
+
+    def get(self, cache_key: str) -> Optional[str]:
+        row = self._conn.execute(
+            "SELECT content, saved_at FROM llm_responses WHERE cache_key = ?",
+            (cache_key,),
+        ).fetchone()
+        if row is None:
+            return None
+        content, saved_at = row
+        if time.time() - saved_at > self._ttl:
+            self._conn.execute(
+                "DELETE FROM llm_responses WHERE cache_key = ?", (cache_key,)
+            )
+            self._conn.commit()
+            return None
+        return content
+
+    def set(self, cache_key: str, content: str):
+        self._conn.execute(
+            "INSERT OR REPLACE INTO llm_responses (cache_key, content, saved_at)"
+            " VALUES (?, ?, ?)",
+            (cache_key, content, time.time()),
+        )
+        self._conn.commit()
+
+    def close(self):
+        self._conn.close()
+
+
+def open_response_cache_from_env() -> Optional[ResponseCache]:
+    """Open the LLM response cache if LLM_CACHE_DB_PATH is configured, else None."""
+    db_path = os.getenv("LLM_CACHE_DB_PATH")
+    if not db_path:
+        return None
+    return ResponseCache(db_path)
@@ -131,6 +131,24 @@ PROVIDER_MODELS = {
 }
 
 
+# Índices pré-computados no import para lookups O(1) nos hot paths
+# (/models, /health e validação de requests).
+_EMPTY: tuple = ()
+_MODELS_BY_TYPE: dict = {}
+_STRUCTURED_OUTPUT: dict = {}
+
+for _provider_id, _provider_data in PROVIDER_MODELS.items():
+    for _model_type in ("transcription", "translation"):
+        _models = _provider_data.get(f"{_model_type}_models", [])
+        _MODELS_BY_TYPE[(_provider_id, _model_type)] = _models
+        for _model in _models:
+            _STRUCTURED_OUTPUT[(_provider_id, _model["id"])] = _model.get(
+                "supports_structured_output", False
+            )
+
+del _provider_id, _provider_data, _model_type, _models, _model
+
+
 def get_provider_models(provider_name: str, model_type: str = "translation"):
     """
     Retorna a lista de modelos para um provider específico.
@@ -142,12 +160,7 @@ def get_provider_models(provider_name: str, model_type: str = "translation"):
     Returns:
         Lista de modelos disponíveis
     """
-    provider = PROVIDER_MODELS.get(provider_name.lower())
-    if not provider:
-        return []
-
-    key = f"{model_type}_models"
-    return provider.get(key, [])
+    return _MODELS_BY_TYPE.get((provider_name.lower(), model_type), _EMPTY)
 
 
 def get_all_providers():
@@ -157,8 +170,4 @@ def get_all_providers():
 
 def model_supports_structured_output(provider_name: str, model_id: str) -> bool:
     """Verifica se um modelo suporta structured output."""
-    models = get_provider_models(provider_name, "translation")
-    for model in models:
-        if model["id"] == model_id:
-            return model.get("supports_structured_output", False)
-    return False
+    return _STRUCTURED_OUTPUT.get((provider_name.lower(), model_id), False)
@@ -1,29 +1,117 @@
+import hashlib
+import heapq
+import logging
+import logging.handlers
 import os
+import queue
 import re
 import subprocess
+import sys
 import time
-import uuid
-import json
 import asyncio
 import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Optional, Dict, Any
-from fastapi import FastAPI, HTTPException, BackgroundTasks
-from fastapi.responses import StreamingResponse
+from fastapi import Depends, FastAPI, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response, StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel, field_validator
+import orjson
 import yt_dlp
-from providers import ProviderFactory
+from cache import open_store_from_env
+from providers import ProviderFactory, TranscriptionProvider
+from providers.vtt_utils import build_vtt_from_segments, parse_vtt_segments
 from config.models import PROVIDER_MODELS, get_provider_models, get_all_providers
 
 
-def get_temp_audio_path(suffix: str = "") -> str:
-    """Generate a temp file path in the system temp directory."""
-    temp_dir = tempfile.gettempdir()
-    filename = f"yt_subtitles_{uuid.uuid4().hex[:8]}{suffix}"
-    return os.path.join(temp_dir, filename)
+logging.basicConfig(format="%(asctime)s %(levelname)s %(message)s", stream=sys.stderr, force=True)
+
+# Emissão de log fora do event loop: os handlers reais rodam numa thread do
+# QueueListener e o caminho quente só enfileira o registro (sem lock de I/O).
+_log_queue: "queue.SimpleQueue" = queue.SimpleQueue()
+_root_logger = logging.getLogger()
+_log_listener = logging.handlers.QueueListener(_log_queue, *_root_logger.handlers)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_queue)]
+_log_listener.start()
+
+log = logging.getLogger("v2t")
+log.setLevel(logging.INFO)
+
+
+@lru_cache(maxsize=1)
+def _cached_providers() -> tuple:
+    """Provider registry is static after import; cache the listing as an immutable tuple."""
+    return tuple(ProviderFactory.list_providers())
+
+
+@lru_cache(maxsize=16)
+def _get_provider_cached(name: str):
+    """Memoized provider lookup; provider instances are stateless singletons."""
+    return ProviderFactory.get_provider(name)
+
+
+CLEANUP_INTERVAL_SECONDS = 60
+# Backpressure bound for the progress bridge queues: a slow client suspends
+# the provider callbacks instead of letting progress lines pile up.
+STREAM_QUEUE_MAXSIZE = 32
+_START_TIME = time.monotonic()
+
+# Dedicated pool for long-running yt-dlp/ffmpeg work so downloads never
+# compete with the shared default executor used by asyncio.to_thread and
+# FastAPI's sync machinery.
+_DL_EXECUTOR = ThreadPoolExecutor(max_workers=16, thread_name_prefix="ytdl")
+
+# Optional SQLite mirror so cached transcriptions survive restarts
+# (enabled via CACHE_DB_PATH, see .env.example).
+cache_store = open_store_from_env()
+
+
+def _load_persisted_caches():
+    if not cache_store:
+        return
+    # The store keeps wall-clock timestamps (they must survive restarts);
+    # in-memory expiry runs on the monotonic clock, so re-anchor the age here.
+    wall_now = time.time()
+    mono_now = time.monotonic()
+    for cache_key, entry in cache_store.load("subtitles", _TTL).items():
+        vtt = entry.get("vtt")
+        if vtt:
+            entry["etag"] = f'"{hashlib.blake2b(vtt.encode(), digest_size=8).hexdigest()}"'
+            entry["json_bytes"] = orjson.dumps({"vtt": vtt, "cached": True})
+            entry["response_bytes"] = _transcription_result_line(vtt, True)
+            entry["cached_at"] = mono_now - (wall_now - entry["cached_at"])
+            subtitle_cache[cache_key] = entry
+            heapq.heappush(_subtitle_expiry_heap, (entry["cached_at"] + _TTL, cache_key))
+    for cache_key, entry in cache_store.load("summaries", _TTL).items():
+        entry["cached_at"] = mono_now - (wall_now - entry["cached_at"])
+        summary_cache[cache_key] = entry
+        heapq.heappush(_summary_expiry_heap, (entry["cached_at"] + _TTL, cache_key))
+
+
+async def _cache_janitor():
+    """Periodically sweep expired cache entries off the request path."""
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL_SECONDS)
+        cleanup_expired_cache()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    _load_persisted_caches()
+    janitor = asyncio.create_task(_cache_janitor())
+    yield
+    janitor.cancel()
+    _DL_EXECUTOR.shutdown(wait=False, cancel_futures=True)
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
+
+# Sem isto, um nginx na frente agrupa os chunks NDJSON e o progresso chega
+# de uma vez no final em vez de em tempo real.
+_STREAM_HEADERS = {"X-Accel-Buffering": "no", "Cache-Control": "no-cache"}
 
 app.add_middleware(
     CORSMiddleware,
@@ -34,24 +122,39 @@ app.add_middleware(
 )
 
 
-@app.middleware("http")
-async def log_request_size(request: Any, call_next: Any) -> Any:
-    try:
+# Header-size policing duplicates what uvicorn/h11 already enforce, and the
+# middleware hop plus the Python loop over headers taxes every request
+# (including /health polls). Kept behind an env flag for debugging only.
+if os.getenv("LOG_HEADER_SIZE"):
+
+    @app.middleware("http")
+    async def log_request_size(request: Any, call_next: Any) -> Any:
         headers_size = sum(len(k) + len(v) for k, v in request.headers.items())
         if headers_size > 8192:
-            print(f"WARNING: Large headers detected: {headers_size} bytes")
-        response = await call_next(request)
-        return response
-    except Exception as e:
-        print(f"Request handling error: {e}")
-        raise
+            log.warning("Large headers detected: %d bytes", headers_size)
+        return await call_next(request)
+
 
+subtitle_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+summary_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
 
-subtitle_cache: Dict[str, Dict[str, Any]] = {}
-summary_cache: Dict[str, Dict[str, Any]] = {}
+# Min-heaps of (expires_at, cache_key) so expiry sweeps touch only items whose
+# time has come, instead of scanning every cache entry. Stale heap entries
+# (superseded by a newer set) are skipped via the freshness check on pop.
+_subtitle_expiry_heap: list = []
+_summary_expiry_heap: list = []
 CACHE_MAX_SIZE = 1000
 CACHE_EXPIRY_HOURS = 24 * 7
+# TTL in seconds, on the monotonic clock: immune to NTP/wall-clock jumps and
+# avoids recomputing the multiplication on every lookup.
+_TTL = CACHE_EXPIRY_HOURS * 3600
 MAX_AUDIO_SIZE_BYTES = 24 * 1024 * 1024
+OPUS_BITRATE_KBPS = 24
+AUDIO_CHUNK_SECONDS = 300
+PARALLEL_TRANSCRIBE_MIN_SECONDS = 600
+# Max simultaneous chunk uploads per job: a 2-hour video splits into ~24
+# chunks, and firing them all at once on one API key is a 429 storm.
+PARALLEL_TRANSCRIBE_CONCURRENCY = 4
 
 
 class TranscribeRequest(BaseModel):
@@ -72,15 +175,15 @@ class TranscribeRequest(BaseModel):
 
     @field_validator("video_url")
     def validate_video_url(cls, v):
-        if not v or "youtube.com" not in v and "youtu.be" not in v:
+        if not v or not _YT_HOST_RE.search(v):
             raise ValueError("Invalid YouTube URL")
         return v
 
     @field_validator("provider")
     def validate_provider(cls, v):
-        available_providers = ProviderFactory.list_providers()
+        available_providers = _cached_providers()
         if v not in available_providers:
-            raise ValueError(f"Invalid provider. Available: {available_providers}")
+            raise ValueError(f"Invalid provider. Available: {list(available_providers)}")
         return v
 
 
@@ -100,15 +203,15 @@ class SummarizeRequest(BaseModel):
 
     @field_validator("video_url")
     def validate_video_url(cls, v):
-        if not v or "youtube.com" not in v and "youtu.be" not in v:
+        if not v or not _YT_HOST_RE.search(v):
             raise ValueError("Invalid YouTube URL")
         return v
 
     @field_validator("provider")
     def validate_provider(cls, v):
-        available_providers = ProviderFactory.list_providers()
+        available_providers = _cached_providers()
         if v not in available_providers:
-            raise ValueError(f"Invalid provider. Available: {available_providers}")
+            raise ValueError(f"Invalid provider. Available: {list(available_providers)}")
         return v
 
 
@@ -120,31 +223,32 @@ class HealthResponse(BaseModel):
     uptime_seconds: float
 
 
+_VIDEO_ID_RE = re.compile(r"(?:v=|/v/|youtu\.be/)([^&\s]+)")
+_YT_HOST_RE = re.compile(r"(?:youtube\.com|youtu\.be)")
+
+
+@lru_cache(maxsize=4096)
 def get_video_id(url: str) -> Optional[str]:
-    match = re.search(r"(?:v=|\/v\/|youtu\.be\/)([^\&\s]+)", url)
+    match = _VIDEO_ID_RE.search(url)
     return match.group(1) if match else None
 
 
-def cleanup_expired_cache():
-    now = time.time()
-    expired = [
-        cache_key
-        for cache_key, data in list(subtitle_cache.items())
-        if now - data.get("cached_at", 0) > CACHE_EXPIRY_HOURS * 3600
-    ]
-    for cache_key in expired:
-        del subtitle_cache[cache_key]
+def _sweep_expiry_heap(heap: list, cache: OrderedDict, now: float) -> int:
+    removed = 0
+    while heap and heap[0][0] <= now:
+        _, cache_key = heapq.heappop(heap)
+        entry = cache.get(cache_key)
+        if entry is not None and now - entry.get("cached_at", 0) > _TTL:
+            del cache[cache_key]
+            removed += 1
+    return removed
 
-    # Also cleanup summary cache
-    expired_summaries = [
-        cache_key
-        for cache_key, data in list(summary_cache.items())
-        if now - data.get("cached_at", 0) > CACHE_EXPIRY_HOURS * 3600
-    ]
-    for cache_key in expired_summaries:
-        del summary_cache[cache_key]
 
-    return len(expired) + len(expired_summaries)
+def cleanup_expired_cache():
+    now = time.monotonic()
+    removed = _sweep_expiry_heap(_subtitle_expiry_heap, subtitle_cache, now)
+    removed += _sweep_expiry_heap(_summary_expiry_heap, summary_cache, now)
+    return removed
 
 
 def get_cached_subtitle(video_id: str, language: str = "original") -> Optional[Dict[str, Any]]:
@@ -153,29 +257,39 @@ def get_cached_subtitle(video_id: str, language: str = "original") -> Optional[D
         return None
 
     data = subtitle_cache[cache_key]
-    now = time.time()
-    age_seconds = now - data.get("cached_at", 0)
+    age_seconds = time.monotonic() - data.get("cached_at", 0)
 
-    if age_seconds > CACHE_EXPIRY_HOURS * 3600:
+    if age_seconds > _TTL:
         del subtitle_cache[cache_key]
         return None
 
+    subtitle_cache.move_to_end(cache_key)
     return data
 
 
 def set_cached_subtitle(video_id: str, vtt: str, language: str = "original"):
-    if len(subtitle_cache) >= CACHE_MAX_SIZE:
-        cleanup_expired_cache()
-        while len(subtitle_cache) >= CACHE_MAX_SIZE:
-            oldest = min(subtitle_cache.items(), key=lambda x: x[1].get("cached_at", 0))
-            del subtitle_cache[oldest[0]]
-
     cache_key = f"{video_id}_{language}"
+    etag = f'"{hashlib.blake2b(vtt.encode(), digest_size=8).hexdigest()}"'
     subtitle_cache[cache_key] = {
         "vtt": vtt,
         "language": language,
-        "cached_at": time.time(),
+        "cached_at": time.monotonic(),
+        "etag": etag,
+        "json_bytes": orjson.dumps({"vtt": vtt, "cached": True}),
+        "response_bytes": _transcription_result_line(vtt, True),
     }
+    subtitle_cache.move_to_end(cache_key)
+    heapq.heappush(
+        _subtitle_expiry_heap, (time.monotonic() + _TTL, cache_key)
+    )
+    if cache_store:
+        cache_store.set("subtitles", cache_key, subtitle_cache[cache_key])
+
+    # LRU eviction: O(1) instead of scanning for the oldest entry
+    while len(subtitle_cache) > CACHE_MAX_SIZE:
+        evicted_key, _ = subtitle_cache.popitem(last=False)
+        if cache_store:
+            cache_store.delete("subtitles", evicted_key)
 
 
 def get_cached_summary(video_id: str, language: str) -> Optional[Dict[str, Any]]:
@@ -185,31 +299,57 @@ def get_cached_summary(video_id: str, language: str) -> Optional[Dict[str, Any]]
         return None
 
     data = summary_cache[cache_key]
-    now = time.time()
-    age_seconds = now - data.get("cached_at", 0)
+    age_seconds = time.monotonic() - data.get("cached_at", 0)
 
-    if age_seconds > CACHE_EXPIRY_HOURS * 3600:
+    if age_seconds > _TTL:
         del summary_cache[cache_key]
         return None
 
+    summary_cache.move_to_end(cache_key)
     return data
 
 
 def set_cached_summary(video_id: str, summary: str, key_moments: list, language: str):
     """Cache summary for a video in a specific language."""
-    if len(summary_cache) >= CACHE_MAX_SIZE:
-        cleanup_expired_cache()
-        while len(summary_cache) >= CACHE_MAX_SIZE:
-            oldest = min(summary_cache.items(), key=lambda x: x[1].get("cached_at", 0))
-            del summary_cache[oldest[0]]
-
     cache_key = f"{video_id}_{language}"
     summary_cache[cache_key] = {
         "summary": summary,
         "key_moments": key_moments,
         "language": language,
-        "cached_at": time.time(),
+        "cached_at": time.monotonic(),
     }
+    summary_cache.move_to_end(cache_key)
+    heapq.heappush(
+        _summary_expiry_heap, (time.monotonic() + _TTL, cache_key)
+    )
+    if cache_store:
+        cache_store.set("summaries", cache_key, summary_cache[cache_key])
+
+    while len(summary_cache) > CACHE_MAX_SIZE:
+        evicted_key, _ = summary_cache.popitem(last=False)
+        if cache_store:
+            cache_store.delete("summaries", evicted_key)
+
+
+# Static yt-dlp options, built once; download_audio only adds the per-call
+# outtmpl. Browser-like headers avoid sporadic 403s.
+_BASE_YDL_OPTS = {
+    "format": "bestaudio/best",
+    "postprocessors": [
+        {
+            "key": "FFmpegExtractAudio",
+            "preferredcodec": "mp3",
+            "preferredquality": "192",
+        }
+    ],
+    "quiet": True,
+    "no_warnings": True,
+    "http_headers": {
+        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-us,en;q=0.5",
+    },
+}
 
 
 def download_audio(video_url: str, output_path: str, progress_callback=None):
@@ -218,30 +358,12 @@ def download_audio(video_url: str, output_path: str, progress_callback=None):
 
     last_error = None
 
+    ydl_opts = {**_BASE_YDL_OPTS, "outtmpl": output_path}
+    ydl = yt_dlp.YoutubeDL(ydl_opts)
+
     for attempt in range(max_retries):
         try:
-            ydl_opts = {
-                "format": "bestaudio/best",
-                "postprocessors": [
-                    {
-                        "key": "FFmpegExtractAudio",
-                        "preferredcodec": "mp3",
-                        "preferredquality": "192",
-                    }
-                ],
-                "outtmpl": output_path,
-                "quiet": True,
-                "no_warnings": True,
-                # Add headers to mimic browser request to avoid 403
-                "http_headers": {
-                    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36",
-                    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
-                    "Accept-Language": "en-us,en;q=0.5",
-                },
-            }
-
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([video_url])
+            ydl.download([video_url])
 
             # If download successful, check for file
             base_path = output_path
@@ -250,11 +372,13 @@ def download_audio(video_url: str, output_path: str, progress_callback=None):
             elif os.path.exists(base_path):
                 return base_path
 
-            directory = os.path.dirname(output_path)
-            filename = os.path.basename(output_path)
-            for f in os.listdir(directory):
-                if f.startswith(filename) and f.endswith(".mp3"):
-                    return os.path.join(directory, f)
+            # Rare miss (yt-dlp mangled the name): scandir yields DirEntry
+            # objects without extra stat calls, unlike listdir + join.
+            directory, prefix = os.path.split(output_path)
+            with os.scandir(directory or ".") as it:
+                for dir_entry in it:
+                    if dir_entry.name.startswith(prefix) and dir_entry.name.endswith(".mp3"):
+                        return dir_entry.path
             
             # If we get here, file wasn't found even though download supposedly finished
             raise Exception("Audio file not found after download")
@@ -265,7 +389,12 @@ def download_audio(video_url: str, output_path: str, progress_callback=None):
             
             # Check if it's a 403 error or similar network issue
             if "403" in error_msg or "forbidden" in error_msg:
-                print(f"[WARN] Download failed with 403 (Attempt {attempt+1}/{max_retries}). Retrying in {retry_delay}s...")
+                log.warning(
+                    "Download failed with 403 (attempt %d/%d). Retrying in %ds...",
+                    attempt + 1,
+                    max_retries,
+                    retry_delay,
+                )
                 time.sleep(retry_delay)
                 retry_delay *= 2  # Exponential backoff
             else:
@@ -276,47 +405,187 @@ def download_audio(video_url: str, output_path: str, progress_callback=None):
             raise e
 
     # If we exhausted retries
-    print(f"[ERROR] Failed to download audio after {max_retries} attempts")
+    log.error("Failed to download audio after %d attempts", max_retries)
     raise last_error or Exception("Failed to download audio")
 
 
+def probe_audio_duration(input_path: str) -> Optional[float]:
+    """Return audio duration in seconds via ffprobe, or None if probing fails."""
+    result = subprocess.run(
+        [
+            "ffprobe",
+            "-v",
+            "quiet",
+            "-show_entries",
+            "format=duration",
+            "-of",
+            "csv=p=0",
+            input_path,
+        ],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    if result.returncode != 0:
+        return None
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return None
+
+
+def _run_ffmpeg_compress(input_path: str, output_path: str, bitrate_kbps: int):
+    ffmpeg_cmd = [
+        "ffmpeg",
+        "-nostdin",
+        "-i",
+        input_path,
+        "-c:a",
+        "libopus",
+        "-b:a",
+        f"{bitrate_kbps}k",
+        "-ar",
+        "16000",
+        "-ac",
+        "1",
+        "-application",
+        "voip",
+        "-y",
+        output_path,
+    ]
+    # ffmpeg is chatty on stdout/stderr even on success; don't buffer or
+    # decode any of it unless the run actually failed.
+    result = subprocess.run(ffmpeg_cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    if result.returncode != 0:
+        raise Exception(f"FFmpeg compression failed: {result.stderr.decode(errors='replace')}")
+
+
 def compress_audio(input_path: str, output_path: str, max_size_bytes: int = MAX_AUDIO_SIZE_BYTES):
-    print(f"Compressing audio (file too large)...")
+    log.info("Compressing audio (file too large)...")
+
+    # Opus at 24 kbps mono/16 kHz is transparent for speech and ~3-4x smaller
+    # than the old MP3 ladder, so a single encode fits the budget except for
+    # extremely long audio, where the analytic estimate lowers it further.
+    target_kbps = OPUS_BITRATE_KBPS
+    duration = probe_audio_duration(input_path)
+    if duration and duration > 0:
+        fitting_kbps = int(max_size_bytes * 8 / duration / 1000 * 0.9)
+        target_kbps = max(8, min(target_kbps, fitting_kbps))
+
+    log.debug("Compressing %.0fs of audio at %dk in a single pass", duration or -1, target_kbps)
+    _run_ffmpeg_compress(input_path, output_path, target_kbps)
+    if os.path.exists(output_path) and os.path.getsize(output_path) < max_size_bytes:
+        return
+
+    raise Exception(f"Could not compress audio below {max_size_bytes} bytes")
 
-    bitrates = ["128k", "96k", "64k", "48k"]
 
-    for bitrate in bitrates:
-        ffmpeg_cmd = [
+def split_audio_for_transcription(
+    audio_path: str, chunk_seconds: int = AUDIO_CHUNK_SECONDS
+) -> list[tuple[float, str]]:
+    """Split audio into fixed-length chunks with ffmpeg. Returns [(offset_seconds, path), ...]."""
+    base, ext = os.path.splitext(audio_path)
+    pattern = f"{base}_chunk_%03d{ext or '.mp3'}"
+    result = subprocess.run(
+        [
             "ffmpeg",
+            "-nostdin",
             "-i",
-            input_path,
-            "-b:a",
-            bitrate,
-            "-ar",
-            "16000",
-            "-ac",
-            "1",
+            audio_path,
+            "-f",
+            "segment",
+            "-segment_time",
+            str(chunk_seconds),
+            "-c",
+            "copy",
             "-y",
-            output_path,
-        ]
-        result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-        if result.returncode != 0:
-            raise Exception(f"FFmpeg compression failed: {result.stderr}")
+            pattern,
+        ],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    if result.returncode != 0:
+        raise Exception(f"FFmpeg segmenting failed: {result.stderr.decode(errors='replace')}")
+
+    chunks = []
+    index = 0
+    while True:
+        chunk_path = pattern % index
+        if not os.path.exists(chunk_path):
+            break
+        chunks.append((float(index * chunk_seconds), chunk_path))
+        index += 1
+    return chunks
+
+
+async def transcribe_audio_parallel(
+    provider, audio_path: str, model: str, api_key: str, base_url: str
+) -> str:
+    """
+    Transcribe audio, splitting long files into chunks dispatched concurrently.
 
-        if os.path.exists(output_path) and os.path.getsize(output_path) < max_size_bytes:
-            return
+    Whisper latency grows roughly linearly with audio length, so transcribing
+    N five-minute chunks in parallel cuts wall-clock time by ~N for long
+    videos. Short audio goes through a single call unchanged.
+    """
+    duration = await asyncio.to_thread(probe_audio_duration, audio_path)
+    if not duration or duration <= PARALLEL_TRANSCRIBE_MIN_SECONDS:
+        return await provider.transcribe(
+            audio_path=audio_path, model=model, api_key=api_key, base_url=base_url
+        )
 
-    raise Exception(f"Could not compress audio below {max_size_bytes} bytes")
+    chunks = await asyncio.to_thread(split_audio_for_transcription, audio_path)
+    sem = asyncio.Semaphore(PARALLEL_TRANSCRIBE_CONCURRENCY)
+
+    async def transcribe_chunk(chunk_path: str) -> str:
+        async with sem:
+            return await provider.transcribe(
+                audio_path=chunk_path, model=model, api_key=api_key, base_url=base_url
+            )
+
+    tasks = [asyncio.ensure_future(transcribe_chunk(path)) for _, path in chunks]
+    try:
+        chunk_vtts = await asyncio.gather(*tasks)
+    except BaseException:
+        # Cancel the siblings before the chunk files below are deleted out
+        # from under them; otherwise orphaned uploads keep burning quota.
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        raise
+    finally:
+        for _, chunk_path in chunks:
+            try:
+                os.remove(chunk_path)
+            except OSError:
+                pass
+
+    merged = []
+    for (offset, _), chunk_vtt in zip(chunks, chunk_vtts):
+        for segment in parse_vtt_segments(chunk_vtt):
+            segment.start += offset
+            segment.end += offset
+            merged.append(segment)
+    return build_vtt_from_segments(merged)
+
+
+# Static part of the health payload, built once: load balancers poll this
+# endpoint at high frequency, so skip per-call model construction.
+_HEALTH_BASE = {
+    "status": "healthy",
+    "version": "1.0.0",
+}
 
 
 @app.get("/health", response_model=HealthResponse)
 async def health_check():
-    return HealthResponse(
-        status="healthy",
-        providers=ProviderFactory.list_providers(),
-        version="1.0.0",
-        cache_size=len(subtitle_cache) + len(summary_cache),
-        uptime_seconds=0,
+    return ORJSONResponse(
+        {
+            **_HEALTH_BASE,
+            "providers": list(_cached_providers()),
+            "cache_size": len(subtitle_cache) + len(summary_cache),
+            "uptime_seconds": time.monotonic() - _START_TIME,
+        }
     )
 
 
@@ -363,532 +632,427 @@ async def get_models(provider: Optional[str] = None):
     return {"providers": all_providers}
 
 
-@app.post("/transcribe")
-async def transcribe_video(request: TranscribeRequest, background_tasks: BackgroundTasks):
-    async def streaming_logic():
-        queue = asyncio.Queue()
-        audio_path_ref = [None]
+def _progress_line(stage: str, progress: int, details: str) -> bytes:
+    """Build an NDJSON progress line without a full json.dumps dict walk.
 
-        async def producer():
-            try:
-                # Immediate initial progress to signal connection
-                await queue.put(
-                    json.dumps(
-                        {
-                            "action": "progress",
-                            "stage": "initializing",
-                            "progress": 10,
-                            "details": "Connected to backend, analyzing request...",
-                        }
-                    )
-                    + "\n"
-                )
+    Stages are hardcoded literals in this module, so only ``details`` needs
+    JSON escaping; the rest of the payload shape is constant. Returned as
+    bytes so StreamingResponse passes it through without re-encoding.
+    """
+    return b'{"action":"progress","stage":"%b","progress":%d,"details":%b}\n' % (
+        stage.encode(),
+        progress,
+        orjson.dumps(details),
+    )
 
-                video_id = get_video_id(request.video_url)
-
-                # Check cache for EXACT target language match
-                if request.check_cache and video_id:
-                    cached = get_cached_subtitle(video_id, request.target_language)
-                    if cached:
-                        await queue.put(
-                            json.dumps(
-                                {
-                                    "action": "transcription_result",
-                                    "success": True,
-                                    "data": {"vtt": cached["vtt"], "cached": True},
-                                }
-                            )
-                            + "\n"
-                        )
-                        await queue.put(None)
-                        return
-
-                provider = ProviderFactory.get_provider(request.provider)
-                if not provider:
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "error",
-                                "error": f"Provider '{request.provider}' not found.",
-                            }
-                        )
-                        + "\n"
-                    )
-                    await queue.put(None)
-                    return
 
-                # Optimization: Check if we have 'original' language cached to skip download/transcription
-                final_vtt = None
-                if request.check_cache and video_id:
-                    cached_original = get_cached_subtitle(video_id, "original")
-                    if cached_original:
-                        print(
-                            f"[DEBUG] Using cached 'original' transcription for translation to {request.target_language}"
-                        )
-                        final_vtt = cached_original["vtt"]
-                        # Skip download and transcription steps
-                        await queue.put(
-                            json.dumps(
-                                {
-                                    "action": "progress",
-                                    "stage": "cached",
-                                    "progress": 70,
-                                    "details": "Using cached transcription",
-                                }
-                            )
-                            + "\n"
-                        )
-
-                if not final_vtt:
-                    # Need to download and transcribe
-                    audio_path = get_temp_audio_path()
-                    audio_path_ref[0] = audio_path
-                    print(f"[DEBUG] Using temp file: {audio_path}")
-                    start_download = time.time()
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "downloading",
-                                "progress": 10,
-                                "details": "Downloading audio (yt-dlp)...",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                    loop = asyncio.get_event_loop()
-                    audio_path = await loop.run_in_executor(
-                        None, download_audio, request.video_url, audio_path
-                    )
-
-                    download_time = time.time() - start_download
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "downloading",
-                                "progress": 30,
-                                "details": f"Download complete ({download_time:.1f}s)",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                    if os.path.exists(audio_path):
-                        file_size = os.path.getsize(audio_path)
-                        if file_size > MAX_AUDIO_SIZE_BYTES:
-                            await queue.put(
-                                json.dumps(
-                                    {
-                                        "action": "progress",
-                                        "stage": "downloading",
-                                        "progress": 100,
-                                        "details": "Compressing audio...",
-                                    }
-                                )
-                                + "\n"
-                            )
-                            compressed_path = get_temp_audio_path(".mp3")
-                            await loop.run_in_executor(
-                                None, compress_audio, audio_path, compressed_path
-                            )
-                            os.remove(audio_path)
-                            audio_path = compressed_path
-                            audio_path_ref[0] = audio_path
-
-                    start_transcribe = time.time()
-                    print(f"Starting transcription with {request.transcription_model}...")
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "transcribing",
-                                "progress": 35,
-                                "details": "Transcribing...",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                    final_vtt = await provider.transcribe(
-                        audio_path=audio_path,
-                        model=request.transcription_model,
-                        api_key=request.api_key,
-                        base_url=request.base_url,
-                    )
-
-                    transcribe_time = time.time() - start_transcribe
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "transcribing",
-                                "progress": 70,
-                                "details": f"Transcription complete ({transcribe_time:.1f}s)",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                    # Cache the ORIGINAL transcription
-                    if video_id:
-                        set_cached_subtitle(video_id, final_vtt, "original")
-                        background_tasks.add_task(cleanup_expired_cache)
-
-                if request.target_language != "original":
-                    print(f"Starting translation to {request.target_language}...")
-                    start_translate = time.time()
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "translating",
-                                "progress": 75,
-                                "details": "Translating...",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                    async def progress_callback(stage, progress, details):
-                        # Map translation progress (0-100) to overall progress (75-95)
-                        overall_progress = 75 + int(progress * 0.2)
-                        await queue.put(
-                            json.dumps(
-                                {
-                                    "action": "progress",
-                                    "stage": stage,
-                                    "progress": overall_progress,
-                                    "details": details,
-                                }
-                            )
-                            + "\n"
-                        )
-
-                    final_vtt = await provider.translate(
-                        vtt_content=final_vtt,
-                        target_language=request.target_language,
-                        model=request.translation_model,
-                        api_key=request.api_key,
-                        base_url=request.base_url,
-                        progress_callback=progress_callback,
-                    )
-
-                    translate_time = time.time() - start_translate
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "translating",
-                                "progress": 95,
-                                "details": f"Translation complete ({translate_time:.1f}s)",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                if video_id:
-                    set_cached_subtitle(video_id, final_vtt, request.target_language)
-                    background_tasks.add_task(cleanup_expired_cache)
-
-                await queue.put(
-                    json.dumps(
-                        {
-                            "action": "transcription_result",
-                            "success": True,
-                            "data": {"vtt": final_vtt, "cached": False},
-                        }
-                    )
-                    + "\n"
-                )
-            except Exception as e:
-                await queue.put(json.dumps({"action": "error", "error": str(e)}) + "\n")
-            finally:
-                if audio_path_ref[0] and os.path.exists(audio_path_ref[0]):
-                    try:
-                        os.remove(audio_path_ref[0])
-                        print(f"[DEBUG] Cleaned up temp file: {audio_path_ref[0]}")
-                    except Exception as e:
-                        print(f"[WARN] Failed to clean up temp file {audio_path_ref[0]}: {e}")
-                else:
-                    if audio_path_ref[0]:
-                        print(
-                            f"[DEBUG] Temp file already deleted or not found: {audio_path_ref[0]}"
-                        )
-                await queue.put(None)
-
-        asyncio.create_task(producer())
+_INIT_PROGRESS_LINE = _progress_line(
+    "initializing", 10, "Connected to backend, analyzing request..."
+)
 
-        while True:
-            item = await queue.get()
-            if item is None:
-                break
-            yield item
 
-    return StreamingResponse(streaming_logic(), media_type="application/x-ndjson")
+def _transcription_result_line(vtt: str, cached: bool) -> bytes:
+    """Build the final NDJSON result line for the /transcribe stream."""
+    return (
+        orjson.dumps(
+            {
+                "action": "transcription_result",
+                "success": True,
+                "data": {"vtt": vtt, "cached": cached},
+            }
+        )
+        + b"\n"
+    )
+
 
+@app.get("/subtitles/{video_id}")
+async def get_subtitles(video_id: str, request: Request, language: str = "original"):
+    """Serve cached subtitles directly, with ETag/304 support for conditional requests."""
+    cached = get_cached_subtitle(video_id, language)
+    if not cached:
+        raise HTTPException(status_code=404, detail="Subtitles not cached for this video")
 
-@app.post("/summarize")
-async def summarize_video(request: SummarizeRequest, background_tasks: BackgroundTasks):
-    async def streaming_logic():
-        queue = asyncio.Queue()
+    etag = cached.get("etag")
+    if etag and request.headers.get("If-None-Match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
 
-        async def producer():
-            audio_path = None
-            try:
-                # Immediate initial progress to signal connection
-                await queue.put(
-                    json.dumps(
-                        {
-                            "action": "progress",
-                            "stage": "initializing",
-                            "progress": 10,
-                            "details": "Connected to backend, analyzing request...",
-                        }
-                    )
-                    + "\n"
-                )
+    body = cached.get("json_bytes") or orjson.dumps({"vtt": cached["vtt"], "cached": True})
+    headers = {"ETag": etag} if etag else {}
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def transcribe_provider_dep(request: TranscribeRequest) -> TranscriptionProvider:
+    """Resolve the provider once per request; FastAPI caches the shared body model."""
+    provider = _get_provider_cached(request.provider)
+    if not provider:
+        raise HTTPException(status_code=404, detail=f"Provider '{request.provider}' not found")
+    return provider
 
-                video_id = get_video_id(request.video_url)
-                print(f"[DEBUG] Summarize request for video_id: {video_id}, language: {request.summary_language}")
-
-                # Check for cached summary first (by language)
-                if video_id:
-                    cached_summary = get_cached_summary(video_id, request.summary_language)
-                    if cached_summary:
-                        print(f"[DEBUG] Cache found for summary in {request.summary_language}")
-                        await queue.put(
-                            json.dumps(
-                                {
-                                    "action": "progress",
-                                    "stage": "cached",
-                                    "progress": 100,
-                                    "details": f"Using cached summary in {request.summary_language}",
-                                }
-                            )
-                            + "\n"
-                        )
-                        await queue.put(
-                            json.dumps(
-                                {
-                                    "action": "summary_result",
-                                    "success": True,
-                                    "data": {
-                                        "summary": cached_summary["summary"],
-                                        "key_moments": cached_summary["key_moments"],
-                                        "video_id": video_id,
-                                        "cached": True,
-                                    },
-                                }
-                            )
-                            + "\n"
-                        )
-                        await queue.put(None)
-                        return
-
-                # Check for cached subtitles first
-                cached = None
-                if video_id:
-                    cached = get_cached_subtitle(video_id, "original")
-
-                provider = ProviderFactory.get_provider(request.provider)
-                if not provider:
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "error",
-                                "error": f"Provider '{request.provider}' not found.",
-                            }
-                        )
-                        + "\n"
-                    )
-                    return
 
-                async def sum_progress_callback(stage, progress, details):
-                    # Map internal summary progress to 75% - 95% (if non-cached) or 25% - 95% (if cached)
-                    base_progress = 75 if not cached else 25
-                    range_size = 20 if not cached else 70
-                    overall_progress = base_progress + int(progress * (range_size / 100))
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": stage,
-                                "progress": overall_progress,
-                                "details": details,
-                            }
-                        )
-                        + "\n"
-                    )
-
-                if cached:
-                    print(f"[DEBUG] Cache found for video_id: {video_id}")
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "cached",
-                                "progress": 15,
-                                "details": "Using cached transcription",
-                            }
-                        )
-                        + "\n"
-                    )
-                    full_text = re.sub(r"WEBVTT\n\n", "", cached["vtt"]).strip()
-                else:
-                    # No cache available, need to download and transcribe
-                    print(f"[DEBUG] No cache found, downloading audio...")
-                    audio_path = get_temp_audio_path()
-
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "downloading",
-                                "progress": 15,
-                                "details": "Downloading video audio...",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                    loop = asyncio.get_event_loop()
-                    audio_path = await loop.run_in_executor(
-                        None, download_audio, request.video_url, audio_path
-                    )
-                    
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "downloading",
-                                "progress": 35,
-                                "details": "Audio downloaded",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                    if os.path.exists(audio_path):
-                        file_size = os.path.getsize(audio_path)
-                        if file_size > MAX_AUDIO_SIZE_BYTES:
-                            compressed_path = get_temp_audio_path(".mp3")
-                            await loop.run_in_executor(
-                                None, compress_audio, audio_path, compressed_path
-                            )
-                            os.remove(audio_path)
-                            audio_path = compressed_path
-
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "transcribing",
-                                "progress": 45,
-                                "details": "Transcribing audio...",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                    # Use whisper for transcription
-                    transcription_model = (
-                        "whisper-1" if request.provider == "openai" else "whisper-large-v3-turbo"
-                    )
-
-                    vtt_content = await provider.transcribe(
-                        audio_path=audio_path,
-                        model=transcription_model,
-                        api_key=request.api_key,
-                        base_url=request.base_url,
-                    )
-
-                    await queue.put(
-                        json.dumps(
-                            {
-                                "action": "progress",
-                                "stage": "transcribing",
-                                "progress": 70,
-                                "details": "Transcription complete",
-                            }
-                        )
-                        + "\n"
-                    )
-
-                    if video_id:
-                        set_cached_subtitle(video_id, vtt_content, "original")
-                    
-                    full_text = re.sub(r"WEBVTT\n\n", "", vtt_content).strip()
-
-                # Start actual summary generation
-                summary_result = await provider.summarize(
-                    transcript=full_text,
-                    target_language=request.summary_language,
-                    model=request.summarization_model,
+def transcribe_video_id_dep(request: TranscribeRequest) -> Optional[str]:
+    return get_video_id(request.video_url)
+
+
+def summarize_provider_dep(request: SummarizeRequest) -> TranscriptionProvider:
+    provider = _get_provider_cached(request.provider)
+    if not provider:
+        raise HTTPException(status_code=404, detail=f"Provider '{request.provider}' not found")
+    return provider
+
+
+def summarize_video_id_dep(request: SummarizeRequest) -> Optional[str]:
+    return get_video_id(request.video_url)
+
+
+async def _pump_progress(task: asyncio.Task, bridge: asyncio.Queue):
+    """Yield progress lines from the bridge queue while a provider task runs.
+
+    Provider progress callbacks fire from a different coroutine, so they need
+    a queue; everything else in the stream yields directly. Once the task
+    finishes, leftover lines are drained before returning.
+    """
+    try:
+        while True:
+            getter = asyncio.ensure_future(bridge.get())
+            done, _ = await asyncio.wait({task, getter}, return_when=asyncio.FIRST_COMPLETED)
+            if getter in done:
+                yield getter.result()
+                continue
+            getter.cancel()
+            while not bridge.empty():
+                yield bridge.get_nowait()
+            return
+    except GeneratorExit:
+        # Client disconnected mid-stream: stop the provider task instead of
+        # letting it keep burning API budget into a dead queue.
+        getter.cancel()
+        task.cancel()
+        raise
+
+
+async def _transcribe_stream(
+    request: TranscribeRequest,
+    provider: TranscriptionProvider,
+    video_id: Optional[str],
+):
+    tmpdir = None
+    try:
+        # Immediate initial progress to signal connection
+        yield _INIT_PROGRESS_LINE
+
+        # Check cache for EXACT target language match
+        if request.check_cache and video_id:
+            cached = get_cached_subtitle(video_id, request.target_language)
+            if cached:
+                # Pre-encoded at cache time; the hit path does zero JSON work.
+                line = cached.get("response_bytes")
+                yield line if line else _transcription_result_line(cached["vtt"], True)
+                return
+
+        # Optimization: Check if we have 'original' language cached to skip download/transcription
+        final_vtt = None
+        if request.check_cache and video_id:
+            cached_original = get_cached_subtitle(video_id, "original")
+            if cached_original:
+                log.debug(
+                    "Using cached 'original' transcription for translation to %s",
+                    request.target_language,
+                )
+                final_vtt = cached_original["vtt"]
+                # Skip download and transcription steps
+                yield _progress_line("cached", 70, "Using cached transcription")
+
+        if not final_vtt:
+            # Need to download and transcribe
+            tmpdir = tempfile.TemporaryDirectory(prefix="v2t_")
+            audio_path = os.path.join(tmpdir.name, "audio")
+            log.debug("Using temp dir: %s", tmpdir.name)
+            start_download = time.time()
+            yield _progress_line("downloading", 10, "Downloading audio (yt-dlp)...")
+
+            loop = asyncio.get_running_loop()
+            audio_path = await loop.run_in_executor(
+                _DL_EXECUTOR, download_audio, request.video_url, audio_path
+            )
+
+            download_time = time.time() - start_download
+            yield _progress_line(
+                "downloading", 30, f"Download complete ({download_time:.1f}s)"
+            )
+
+            file_size = await asyncio.to_thread(
+                lambda p: os.path.getsize(p) if os.path.exists(p) else 0, audio_path
+            )
+            if file_size > MAX_AUDIO_SIZE_BYTES:
+                yield _progress_line("downloading", 100, "Compressing audio...")
+                compressed_path = os.path.join(tmpdir.name, "compressed.ogg")
+                await loop.run_in_executor(
+                    _DL_EXECUTOR, compress_audio, audio_path, compressed_path
+                )
+                await asyncio.to_thread(os.remove, audio_path)
+                audio_path = compressed_path
+
+            start_transcribe = time.time()
+            log.info("Starting transcription with %s...", request.transcription_model)
+            yield _progress_line("transcribing", 35, "Transcribing...")
+
+            final_vtt = await transcribe_audio_parallel(
+                provider,
+                audio_path,
+                request.transcription_model,
+                request.api_key,
+                request.base_url,
+            )
+
+            transcribe_time = time.time() - start_transcribe
+            yield _progress_line(
+                "transcribing", 70, f"Transcription complete ({transcribe_time:.1f}s)"
+            )
+
+            # Cache the ORIGINAL transcription
+            if video_id:
+                set_cached_subtitle(video_id, final_vtt, "original")
+
+        if request.target_language != "original":
+            log.info("Starting translation to %s...", request.target_language)
+            start_translate = time.time()
+            yield _progress_line("translating", 75, "Translating...")
+
+            bridge: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_MAXSIZE)
+            last_stage, last_progress = None, -100
+
+            async def progress_callback(stage, progress, details):
+                # Map translation progress (0-100) to overall progress (75-95)
+                overall_progress = 75 + int(progress * 0.2)
+                # Coalesce micro-updates: only forward a line when the stage
+                # changes or the bar moves at least 5 points.
+                nonlocal last_stage, last_progress
+                if stage == last_stage and overall_progress - last_progress < 5:
+                    return
+                last_stage, last_progress = stage, overall_progress
+                await bridge.put(_progress_line(stage, overall_progress, details))
+
+            translate_task = asyncio.create_task(
+                provider.translate(
+                    vtt_content=final_vtt,
+                    target_language=request.target_language,
+                    model=request.translation_model,
                     api_key=request.api_key,
                     base_url=request.base_url,
-                    progress_callback=sum_progress_callback,
+                    progress_callback=progress_callback,
                 )
+            )
+            async for line in _pump_progress(translate_task, bridge):
+                yield line
+            final_vtt = translate_task.result()
+
+            translate_time = time.time() - start_translate
+            yield _progress_line(
+                "translating", 95, f"Translation complete ({translate_time:.1f}s)"
+            )
+
+        # The original-language VTT was already cached above; a second write
+        # for the same key would only churn LRU order and the expiry heap.
+        if video_id and request.target_language != "original":
+            set_cached_subtitle(video_id, final_vtt, request.target_language)
+
+        yield _transcription_result_line(final_vtt, False)
+    except Exception as e:
+        yield orjson.dumps({"action": "error", "error": str(e)}) + b"\n"
+    finally:
+        if tmpdir:
+            try:
+                await asyncio.to_thread(tmpdir.cleanup)
+                log.debug("Cleaned up temp dir: %s", tmpdir.name)
+            except Exception as e:
+                log.warning("Failed to clean up temp dir %s: %s", tmpdir.name, e)
 
-                summary_text = summary_result.get("summary", "")
-                key_moments = summary_result.get("key_moments", [])
-
-                # Cache the summary with its language
-                if video_id:
-                    set_cached_summary(video_id, summary_text, key_moments, request.summary_language)
-                    background_tasks.add_task(cleanup_expired_cache)
-
-                await queue.put(
-                    json.dumps(
-                        {
-                            "action": "progress",
-                            "stage": "summarizing",
-                            "progress": 100,
-                            "details": "Summary complete",
-                        }
-                    )
-                    + "\n"
-                )
 
-                await queue.put(
-                    json.dumps(
-                        {
-                            "action": "summary_result",
-                            "success": True,
-                            "data": {
-                                "summary": summary_text,
-                                "key_moments": key_moments,
-                                "video_id": video_id,
-                                "cached": bool(cached),
-                            },
-                        }
-                    )
-                    + "\n"
+@app.post("/transcribe")
+async def transcribe_video(
+    request: TranscribeRequest,
+    provider: TranscriptionProvider = Depends(transcribe_provider_dep),
+    video_id: Optional[str] = Depends(transcribe_video_id_dep),
+):
+    return StreamingResponse(
+        _transcribe_stream(request, provider, video_id),
+        media_type="application/x-ndjson",
+        headers=_STREAM_HEADERS,
+    )
+
+
+async def _summarize_stream(
+    request: SummarizeRequest,
+    provider: TranscriptionProvider,
+    video_id: Optional[str],
+):
+    tmpdir = None
+    try:
+        # Immediate initial progress to signal connection
+        yield _INIT_PROGRESS_LINE
+
+        log.debug(
+            "Summarize request for video_id: %s, language: %s",
+            video_id,
+            request.summary_language,
+        )
+
+        # Check for cached summary first (by language)
+        if video_id:
+            cached_summary = get_cached_summary(video_id, request.summary_language)
+            if cached_summary:
+                log.debug("Cache found for summary in %s", request.summary_language)
+                yield _progress_line(
+                    "cached", 100, f"Using cached summary in {request.summary_language}"
+                )
+                yield orjson.dumps(
+                    {
+                        "action": "summary_result",
+                        "success": True,
+                        "data": {
+                            "summary": cached_summary["summary"],
+                            "key_moments": cached_summary["key_moments"],
+                            "video_id": video_id,
+                            "cached": True,
+                        },
+                    }
+                ) + b"\n"
+                return
+
+        # Check for cached subtitles first
+        cached = None
+        if video_id:
+            cached = get_cached_subtitle(video_id, "original")
+
+        if cached:
+            log.debug("Cache found for video_id: %s", video_id)
+            yield _progress_line("cached", 15, "Using cached transcription")
+            full_text = cached["vtt"].removeprefix("WEBVTT\n\n").strip()
+        else:
+            # No cache available, need to download and transcribe
+            log.debug("No cache found, downloading audio...")
+            tmpdir = tempfile.TemporaryDirectory(prefix="v2t_")
+            audio_path = os.path.join(tmpdir.name, "audio")
+
+            yield _progress_line("downloading", 15, "Downloading video audio...")
+
+            loop = asyncio.get_running_loop()
+            audio_path = await loop.run_in_executor(
+                _DL_EXECUTOR, download_audio, request.video_url, audio_path
+            )
+
+            yield _progress_line("downloading", 35, "Audio downloaded")
+
+            file_size = await asyncio.to_thread(
+                lambda p: os.path.getsize(p) if os.path.exists(p) else 0, audio_path
+            )
+            if file_size > MAX_AUDIO_SIZE_BYTES:
+                compressed_path = os.path.join(tmpdir.name, "compressed.ogg")
+                await loop.run_in_executor(
+                    _DL_EXECUTOR, compress_audio, audio_path, compressed_path
                 )
+                await asyncio.to_thread(os.remove, audio_path)
+                audio_path = compressed_path
+
+            yield _progress_line("transcribing", 45, "Transcribing audio...")
+
+            # Use whisper for transcription
+            transcription_model = (
+                "whisper-1" if request.provider == "openai" else "whisper-large-v3-turbo"
+            )
+
+            vtt_content = await transcribe_audio_parallel(
+                provider,
+                audio_path,
+                transcription_model,
+                request.api_key,
+                request.base_url,
+            )
+
+            yield _progress_line("transcribing", 70, "Transcription complete")
+
+            if video_id:
+                set_cached_subtitle(video_id, vtt_content, "original")
+
+            full_text = vtt_content.removeprefix("WEBVTT\n\n").strip()
+
+        bridge: asyncio.Queue = asyncio.Queue(maxsize=STREAM_QUEUE_MAXSIZE)
+        last_stage, last_progress = None, -100
+
+        async def sum_progress_callback(stage, progress, details):
+            # Map internal summary progress to 75% - 95% (if non-cached) or 25% - 95% (if cached)
+            base_progress = 75 if not cached else 25
+            range_size = 20 if not cached else 70
+            overall_progress = base_progress + int(progress * (range_size / 100))
+            # Coalesce micro-updates: only forward a line when the stage
+            # changes or the bar moves at least 5 points.
+            nonlocal last_stage, last_progress
+            if stage == last_stage and overall_progress - last_progress < 5:
+                return
+            last_stage, last_progress = stage, overall_progress
+            await bridge.put(_progress_line(stage, overall_progress, details))
+
+        # Start actual summary generation
+        summarize_task = asyncio.create_task(
+            provider.summarize(
+                transcript=full_text,
+                target_language=request.summary_language,
+                model=request.summarization_model,
+                api_key=request.api_key,
+                base_url=request.base_url,
+                progress_callback=sum_progress_callback,
+            )
+        )
+        async for line in _pump_progress(summarize_task, bridge):
+            yield line
+        summary_result = summarize_task.result()
+
+        summary_text = summary_result.get("summary", "")
+        key_moments = summary_result.get("key_moments", [])
+
+        # Cache the summary with its language
+        if video_id:
+            set_cached_summary(video_id, summary_text, key_moments, request.summary_language)
+
+        yield _progress_line("summarizing", 100, "Summary complete")
+
+        yield orjson.dumps(
+            {
+                "action": "summary_result",
+                "success": True,
+                "data": {
+                    "summary": summary_text,
+                    "key_moments": key_moments,
+                    "video_id": video_id,
+                    "cached": bool(cached),
+                },
+            }
+        ) + b"\n"
 
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        yield orjson.dumps({"action": "error", "error": str(e)}) + b"\n"
+    finally:
+        if tmpdir:
+            try:
+                await asyncio.to_thread(tmpdir.cleanup)
+                log.debug("Cleaned up temp dir: %s", tmpdir.name)
             except Exception as e:
-                import traceback
-                traceback.print_exc()
-                await queue.put(json.dumps({"action": "error", "error": str(e)}) + "\n")
-            finally:
-                if audio_path and os.path.exists(audio_path):
-                    try:
-                        os.remove(audio_path)
-                        print(f"[DEBUG] Cleaned up temp file: {audio_path}")
-                    except Exception as e:
-                        print(f"[WARN] Failed to clean up temp file {audio_path}: {e}")
-                await queue.put(None)
-
-        asyncio.create_task(producer())
+                log.warning("Failed to clean up temp dir %s: %s", tmpdir.name, e)
 
-        while True:
-            item = await queue.get()
-            if item is None:
-                break
-            yield item
 
-    return StreamingResponse(streaming_logic(), media_type="application/x-ndjson")
+@app.post("/summarize")
+async def summarize_video(
+    request: SummarizeRequest,
+    provider: TranscriptionProvider = Depends(summarize_provider_dep),
+    video_id: Optional[str] = Depends(summarize_video_id_dep),
+):
+    return StreamingResponse(
+        _summarize_stream(request, provider, video_id),
+        media_type="application/x-ndjson",
+        headers=_STREAM_HEADERS,
+    )
 
 
 @app.delete("/cache")
@@ -896,20 +1060,29 @@ async def clear_cache():
     initial_subtitles = len(subtitle_cache)
     initial_summaries = len(summary_cache)
     total_count = initial_subtitles + initial_summaries
-    print(f"DEBUG: Clearing cache. Subtitles: {initial_subtitles}, Summaries: {initial_summaries}, Total: {total_count}")
+    log.debug(
+        "Clearing cache. Subtitles: %d, Summaries: %d, Total: %d",
+        initial_subtitles,
+        initial_summaries,
+        total_count,
+    )
 
     subtitle_cache.clear()
     summary_cache.clear()
+    if cache_store:
+        cache_store.clear()
 
     final_subtitles = len(subtitle_cache)
     final_summaries = len(summary_cache)
     final_count = final_subtitles + final_summaries
 
     if final_count != 0:
-        print(f"ERROR: Failed to clear cache! subtitles={final_subtitles}, summaries={final_summaries}")
+        log.error(
+            "Failed to clear cache! subtitles=%d, summaries=%d", final_subtitles, final_summaries
+        )
         raise HTTPException(status_code=500, detail="Failed to clear cache")
 
-    print(f"SUCCESS: Cache cleared. entries removed: {total_count}")
+    log.info("Cache cleared. Entries removed: %d", total_count)
     return {"message": "Cache cleared successfully", "removed_count": total_count}
 
 
@@ -12,3 +12,4 @@ __all__ = [
 
 ProviderFactory.register("openai", OpenAIProvider())
 ProviderFactory.register("groq", GroqProvider())
+ProviderFactory.seal()
@@ -3,10 +3,14 @@ Provider Groq usando LiteLLM.
 Otimizado para performance com suporte a structured output para modelos específicos.
 """
 
+import logging
+import os
 from typing import Optional
 from .litellm_base import LiteLLMProvider
 from config.models import model_supports_structured_output
 
+log = logging.getLogger("v2t.groq")
+
 
 class GroqProvider(LiteLLMProvider):
     """Provider para Groq via LiteLLM otimizado para velocidade e qualidade."""
@@ -18,6 +22,16 @@ class GroqProvider(LiteLLMProvider):
         """Pode usar concorrência padrão do LiteLLM (10)."""
         return 10
 
+    def get_rpm_limit(self) -> Optional[int]:
+        """RPM do tier Groq em uso (GROQ_RPM_LIMIT); sem a env var, sem limite."""
+        rpm = int(os.getenv("GROQ_RPM_LIMIT", "0"))
+        return rpm or None
+
+    def get_tpm_limit(self):
+        """TPM do tier Groq em uso (GROQ_TPM_LIMIT); sem a env var, sem limite."""
+        tpm = int(os.getenv("GROQ_TPM_LIMIT", "0"))
+        return tpm or None
+
     def use_structured_output(self, model: str = None) -> bool:
         """
         Verifica se o modelo específico suporta structured output (strict mode).
@@ -54,7 +68,7 @@ class GroqProvider(LiteLLMProvider):
         # Use json_object (best-effort) for all models
         # Faster than strict: true and sufficient for batch translation
         params["response_format"] = {"type": "json_object"}
-        print(f"[DEBUG] Using best-effort JSON for model: {model}")
+        log.debug("Using best-effort JSON for model: %s", model)
 
         return params
 
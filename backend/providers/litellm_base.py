@@ -5,14 +5,291 @@ Todos os providers que usam LiteLLM podem herdar desta classe.
 
 import json
 import asyncio
+import atexit
+import hashlib
+import logging
+import mmap
 import os
+import random
+import re
+import time
+from collections import OrderedDict
+from types import MappingProxyType
 from typing import List, Optional
+import httpx
 import litellm
+from cache import open_response_cache_from_env
 from .base import TranscriptionProvider, TranscriptionSegment
 from .vtt_utils import parse_vtt_segments, build_vtt_from_segments
 
 BATCH_SIZE = 150
 
+# Lazy %s em vez de print+f-string: nada é formatado quando o nível está
+# desligado e a emissão não disputa o lock do stdout no caminho concorrente.
+log = logging.getLogger("v2t.litellm")
+
+# Segmentos sem nenhum caractere de palavra ([Música], ♪ ♪, "...") não têm
+# o que traduzir: passam direto, sem gastar tokens nem vaga no lote.
+_WORD_RE = re.compile(r"\w")
+
+try:
+    import tiktoken
+
+    _ENCODER = tiktoken.get_encoding("cl100k_base")
+except ImportError:  # tiktoken é opcional; cai na heurística de caracteres
+    _ENCODER = None
+
+
+def _trim_to_tokens(text: str, max_tokens: int) -> str:
+    """Corta o texto nos primeiros max_tokens tokens.
+
+    O corte por caracteres desperdiça orçamento em texto ASCII e pode partir
+    um codepoint multibyte na borda; cortar por tokens maximiza o conteúdo
+    útil no prompt. Sem tiktoken, aproxima por ~4 chars/token.
+    """
+    if _ENCODER is not None:
+        ids = _ENCODER.encode(text)
+        if len(ids) <= max_tokens:
+            return text
+        return _ENCODER.decode(ids[:max_tokens])
+    return text[: max_tokens * 4]
+
+
+def _estimate_tokens(text: str) -> int:
+    """Estima tokens de um texto: contagem real com tiktoken, ~4 chars/token sem."""
+    if _ENCODER is not None:
+        return len(_ENCODER.encode(text))
+    return len(text) // 4 + 1
+
+
+try:
+    import orjson
+
+    def _json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+
+    _json_loads = orjson.loads
+except ImportError:  # orjson é opcional; o stdlib cobre o mesmo contrato
+
+    def _json_dumps(obj) -> str:
+        return json.dumps(obj, ensure_ascii=False)
+
+    _json_loads = json.loads
+
+
+def _make_shared_client() -> httpx.AsyncClient:
+    """Cliente HTTP compartilhado por todas as chamadas LiteLLM.
+
+    Sem ele, cada acompletion abre conexão e refaz o handshake TLS; com o
+    pool keep-alive os lotes de tradução reutilizam as mesmas conexões.
+    HTTP/2 multiplexa tudo em um socket quando o extra 'h2' está instalado.
+    """
+    try:
+        import h2  # noqa: F401
+
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=100),
+    )
+
+
+litellm.aclient_session = _make_shared_client()
+
+
+@atexit.register
+def _close_shared_client():
+    # Fecha as conexões keep-alive de forma limpa no shutdown do processo;
+    # fora de um loop ativo dá para rodar o aclose num loop descartável.
+    try:
+        asyncio.run(litellm.aclient_session.aclose())
+    except RuntimeError:
+        pass
+
+
+# Cache opcional de respostas LLM em disco (LLM_CACHE_DB_PATH): reprocessar
+# o mesmo vídeo vira leitura local em vez de refazer cada chamada.
+_response_cache = open_response_cache_from_env()
+
+
+def _response_cache_key(model: str, messages: list, params) -> str:
+    safe_params = {k: v for k, v in dict(params).items() if k != "api_key"}
+    payload = json.dumps(
+        {"model": model, "messages": messages, "params": safe_params},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _open_audio_mapped(audio_path: str):
+    """Abre o áudio e tenta mapeá-lo com mmap (None se não mapeável)."""
+    audio_file = open(audio_path, "rb")
+    try:
+        mapped = mmap.mmap(audio_file.fileno(), 0, access=mmap.ACCESS_READ)
+    except (ValueError, OSError, TypeError):
+        # Arquivo vazio ou handle não mapeável: usa o handle direto.
+        mapped = None
+    return audio_file, mapped
+
+
+class TokenBucket:
+    """Limitador de taxa assíncrono (token bucket).
+
+    O semáforo limita chamadas em voo, mas não o ritmo de despacho; em tiers
+    com RPM baixo isso vira 429 + retry serializado. O bucket reabastece na
+    taxa permitida e cada lote espera exatamente o necessário, sem backoff.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self._rate = rate_per_minute / 60.0
+        self._capacity = capacity if capacity is not None else max(1.0, rate_per_minute / 6.0)
+        self._tokens = self._capacity
+        self._last = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, n: float = 1.0):
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self._capacity, self._tokens + (now - self._last) * self._rate)
+            self._last = now
+            self._tokens -= n
+            wait = -self._tokens / self._rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+# Memo de traduções por segmento: faixas de legenda repetem muitas linhas
+# (vinhetas, refrões, bordões). Chave por (idioma, modelo, hash do texto);
+# LRU manual com teto para o processo não crescer sem limite.
+_TX_CACHE: OrderedDict = OrderedDict()
+_TX_CACHE_MAX = 10_000
+
+
+def _tx_cache_get(key) -> Optional[str]:
+    value = _TX_CACHE.get(key)
+    if value is not None:
+        _TX_CACHE.move_to_end(key)
+    return value
+
+
+def _tx_cache_put(key, value: str):
+    _TX_CACHE[key] = value
+    _TX_CACHE.move_to_end(key)
+    if len(_TX_CACHE) > _TX_CACHE_MAX:
+        _TX_CACHE.popitem(last=False)
+
+
+class AdaptiveLimiter:
+    """Limite de concorrência adaptativo (AIMD), estilo controle de congestão.
+
+    Um teto fixo de chamadas em voo deixa vazão na mesa nos modelos rápidos
+    e provoca 429 nos lentos. Aqui cada K sucessos somam uma permissão
+    (aumento aditivo) e um 429 corta o teto pela metade (redução
+    multiplicativa); a instância é compartilhada por (provider, modelo),
+    então jobs seguintes partem do último teto conhecido.
+    """
+
+    def __init__(self, initial: int = 10, minimum: int = 1, maximum: int = 64,
+                 increase_every: int = 8):
+        self._permits = initial
+        self._min = minimum
+        self._max = maximum
+        self._increase_every = increase_every
+        self._successes = 0
+        self._in_flight = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            while self._in_flight >= self._permits:
+                await self._cond.wait()
+            self._in_flight += 1
+
+    async def __aexit__(self, exc_type, exc, tb):
+        async with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        self._successes += 1
+        if self._successes >= self._increase_every and self._permits < self._max:
+            self._successes = 0
+            self._permits += 1
+
+    def on_ratelimit(self):
+        self._successes = 0
+        self._permits = max(self._min, self._permits // 2)
+
+
+# Nomes de idioma por código, compartilhados por resumo e momentos-chave
+# (imutável: dois métodos montavam o mesmo dict a cada chamada).
+_LANG_NAMES = MappingProxyType(
+    {
+        "en": "English",
+        "pt": "Portuguese (Brasil)",
+        "es": "Spanish",
+        "fr": "French",
+        "de": "German",
+        "it": "Italian",
+        "ja": "Japanese",
+        "ko": "Korean",
+        "zh": "Chinese",
+    }
+)
+
+
+def _resolve_lang_name(target_language: str) -> str:
+    if target_language == "original":
+        return "the original language of this text"
+    return _LANG_NAMES.get(target_language, target_language)
+
+
+class _KeyPool:
+    """Round-robin sobre um valor de api_key com várias chaves (vírgulas).
+
+    Uma chave só tem um orçamento de RPM/TPM; com N chaves no mesmo valor o
+    throughput escala e um 429/5xx numa delas só a tira de rotação por um
+    cooldown, em vez de derrubar a tradução inteira. Valor sem vírgula
+    degrada para pool de uma chave (comportamento idêntico ao atual).
+    """
+
+    # api_key chega por requisição, de clientes arbitrários: LRU com teto
+    # (como _TX_CACHE), senão cada chave distinta vaza um pool para sempre.
+    _pools: OrderedDict = OrderedDict()
+    _POOLS_MAX = 256
+
+    def __init__(self, keys: List[str]):
+        self._keys = keys
+        self._idx = 0
+        self._cooldown_until: dict = {}
+
+    @classmethod
+    def of(cls, api_key: str) -> "_KeyPool":
+        pool = cls._pools.get(api_key)
+        if pool is None:
+            keys = [k.strip() for k in (api_key or "").split(",") if k.strip()]
+            pool = cls._pools[api_key] = cls(keys or [api_key])
+        cls._pools.move_to_end(api_key)
+        if len(cls._pools) > cls._POOLS_MAX:
+            cls._pools.popitem(last=False)
+        return pool
+
+    def pick(self) -> str:
+        now = time.monotonic()
+        for _ in range(len(self._keys)):
+            key = self._keys[self._idx % len(self._keys)]
+            self._idx += 1
+            if self._cooldown_until.get(key, 0.0) <= now:
+                return key
+        # Todas em cooldown: usa a que libera primeiro em vez de travar.
+        return min(self._keys, key=lambda k: self._cooldown_until.get(k, 0.0))
+
+    def penalize(self, key: str, seconds: float = 60.0):
+        self._cooldown_until[key] = time.monotonic() + seconds
+
+
 # Cache for loaded prompts
 _prompt_cache = {}
 
@@ -29,8 +306,12 @@ def load_prompt(prompt_type: str, lang: str = "en") -> str:
         The prompt text with placeholders
     """
     cache_key = f"{prompt_type}_{lang}"
-    if cache_key in _prompt_cache:
-        return _prompt_cache[cache_key]
+    cached = _prompt_cache.get(cache_key)
+    if cached is None:
+        # O bootstrap abaixo indexa os arquivos genéricos pelo stem.
+        cached = _prompt_cache.get(prompt_type)
+    if cached is not None:
+        return cached
 
     # Look for language-specific prompts first, then fallback to default
     possible_paths = [
@@ -82,6 +363,62 @@ def format_prompt(prompt_template: str, **kwargs) -> str:
     return prompt_template.format(**kwargs)
 
 
+def _bootstrap_prompts():
+    """Carrega todos os prompts de disco uma vez, no import do módulo.
+
+    Sem isso, o primeiro lote de cada (tipo, idioma) paga abspath/exists/open
+    síncronos dentro do caminho assíncrono — e sob concorrência vários lotes
+    disputam o mesmo arquivo. Com o cache pré-populado, load_prompt vira um
+    lookup de dict puro no hot path.
+    """
+    prompts_dir = os.path.join(os.path.dirname(__file__), "..", "prompts")
+    try:
+        with os.scandir(prompts_dir) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(".txt"):
+                    with open(entry.path, "r", encoding="utf-8") as f:
+                        _prompt_cache[entry.name[:-4]] = f.read()
+    except OSError:
+        pass  # Sem diretório de prompts: load_prompt cai nos fallbacks.
+
+
+_bootstrap_prompts()
+
+
+# Prompts formatados, por (tipo, kwargs): `load_prompt` memoiza só o template
+# cru, mas o `str.format` re-rodava a cada lote. O texto formatado é idêntico
+# para todos os lotes de um job e entre jobs com os mesmos parâmetros — e
+# prompts repetidos byte a byte aproveitam cache de prefixo no provider.
+_FMT_PROMPT_CACHE: dict = {}
+
+
+def get_formatted_prompt(prompt_type: str, **kwargs) -> str:
+    """Load + format a prompt, memoizing the formatted result per kwargs."""
+    key = (prompt_type, tuple(sorted(kwargs.items())))
+    prompt = _FMT_PROMPT_CACHE.get(key)
+    if prompt is None:
+        prompt = _FMT_PROMPT_CACHE[key] = format_prompt(load_prompt(prompt_type), **kwargs)
+    return prompt
+
+
+def _cached_system_prompt(prompt_type: str, target_language: str) -> str:
+    return get_formatted_prompt(prompt_type, target_language=target_language)
+
+
+# O prompt de sistema fica 100% estático (o idioma vira uma referência
+# genérica) e o idioma real vai numa segunda mensagem de sistema curta.
+# Assim o prefixo longo é byte-idêntico entre todos os lotes E idiomas,
+# e o KV-cache de prefixo do provider cobre tudo até a divergência tardia.
+_STATIC_LANG_REF = "the target language specified in the next system message"
+
+
+def _static_system_messages(prompt_type: str, target_language: str) -> list:
+    return [
+        {"role": "system", "content": _cached_system_prompt(prompt_type, _STATIC_LANG_REF)},
+        {"role": "system", "content": f"Target language: {target_language}"},
+    ]
+
+
 class LiteLLMProvider(TranscriptionProvider):
     """
     Provider base que usa LiteLLM para transcrição e tradução.
@@ -97,8 +434,101 @@ class LiteLLMProvider(TranscriptionProvider):
         """Timeout em segundos para chamadas de API. Pode ser sobrescrito."""
         return 600  # 10 minutes
 
+    def get_rpm_limit(self) -> Optional[int]:
+        """Limite de requisições/minuto do provider; None desativa o bucket."""
+        return None
+
+    def get_tpm_limit(self) -> Optional[int]:
+        """Limite de tokens/minuto do provider; None desativa o bucket."""
+        return None
+
+    def get_max_batch_tokens(self) -> int:
+        """Orçamento aproximado de tokens de entrada por lote de tradução."""
+        return 3000
+
+    def get_summary_max_tokens(self) -> int:
+        """Orçamento de tokens do transcrito enviado para resumo."""
+        return 4000
+
+    def get_key_moments_max_tokens(self) -> int:
+        """Orçamento de tokens do transcrito enviado para momentos-chave."""
+        return 5000
+
+    def _analysis_budget(self) -> int:
+        """Orçamento único para resumo e momentos-chave.
+
+        Os dois caminhos aparam no MESMO limite para enviarem transcritos
+        byte-idênticos: prefixos iguais reaproveitam o cache de prompt do
+        provider entre as duas requisições paralelas.
+        """
+        return max(self.get_summary_max_tokens(), self.get_key_moments_max_tokens())
+
+    def _pack_batches(
+        self, segments: List[TranscriptionSegment]
+    ) -> List[List[TranscriptionSegment]]:
+        """Empacota segmentos por estimativa de tokens em vez de contagem fixa.
+
+        Diálogo curto cabe em poucos lotes grandes (menos round-trips);
+        narração densa gera lotes menores, longe do limite em que o modelo
+        trunca a resposta e dispara o aviso de contagem divergente.
+        BATCH_SIZE continua como teto duro de itens por lote. Com tiktoken
+        instalado a contagem é exata; sem, vale a heurística de caracteres.
+        """
+        limit = self.get_max_batch_tokens()
+        batches: List[List[TranscriptionSegment]] = []
+        current: List[TranscriptionSegment] = []
+        size = 0
+        for seg in segments:
+            tokens = _estimate_tokens(seg.text)
+            if current and (size + tokens > limit or len(current) >= BATCH_SIZE):
+                batches.append(current)
+                current = []
+                size = 0
+            current.append(seg)
+            size += tokens
+        if current:
+            batches.append(current)
+        return batches
+
+    _rate_buckets: dict = {}
+    _limiters: dict = {}
+
+    def _adaptive_limiter(self, model: str) -> AdaptiveLimiter:
+        key = f"{self.get_name()}:{model}"
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._limiters[key] = AdaptiveLimiter(
+                initial=self.get_concurrency_limit()
+            )
+        return limiter
+
+    def _rate_bucket(self) -> Optional[TokenBucket]:
+        rpm = self.get_rpm_limit()
+        if not rpm:
+            return None
+        key = f"{self.get_name()}:rpm:{rpm}"
+        bucket = self._rate_buckets.get(key)
+        if bucket is None:
+            bucket = self._rate_buckets[key] = TokenBucket(rpm)
+        return bucket
+
+    def _tpm_bucket(self) -> Optional[TokenBucket]:
+        tpm = self.get_tpm_limit()
+        if not tpm:
+            return None
+        key = f"{self.get_name()}:tpm:{tpm}"
+        bucket = self._rate_buckets.get(key)
+        if bucket is None:
+            bucket = self._rate_buckets[key] = TokenBucket(tpm)
+        return bucket
+
     def use_structured_output(self, model: str = None) -> bool:
-        """Se True, usa structured output (json_schema strict mode). Pode ser sobrescrito."""
+        """Se True, usa structured output (json_schema strict mode) por padrão.
+
+        Decodificação com strict:true compila uma gramática por requisição e
+        reduz tokens/s; o padrão é json_object (best-effort), com strict
+        disponível por chamada via translate(strict=True).
+        """
         return False
 
     def get_translation_schema(self) -> dict:
@@ -152,25 +582,78 @@ class LiteLLMProvider(TranscriptionProvider):
 
         return params
 
+    _params_cache: dict = {}
+
+    def _cached_translation_params(
+        self, model: str, api_key: str, base_url: str, strict: bool = False
+    ):
+        """Memoiza get_translation_params por (provider, model, credenciais).
+
+        Os parâmetros são idênticos para todos os lotes de um job (e entre
+        jobs do mesmo usuário); montar o dict e o json_schema uma vez evita
+        N alocações por tradução. O MappingProxyType impede que um lote
+        mute o dict compartilhado. strict=True força json_schema strict para
+        quem optar explicitamente.
+        """
+        key = (type(self).__name__, model, api_key, base_url, strict)
+        params = self._params_cache.get(key)
+        if params is None:
+            if len(self._params_cache) > 256:
+                self._params_cache.clear()
+            built = self.get_translation_params(model, api_key, base_url)
+            if strict:
+                built = dict(built)
+                built["response_format"] = {
+                    "type": "json_schema",
+                    "json_schema": {
+                        "name": "batch_translation",
+                        "strict": True,
+                        "schema": self.get_translation_schema(),
+                    },
+                }
+            params = MappingProxyType(built)
+            self._params_cache[key] = params
+        return params
+
     async def transcribe(
         self, audio_path: str, model: str, api_key: str, base_url: str, **kwargs
     ) -> str:
         """Transcreve áudio usando LiteLLM (async)."""
         provider_prefix = self.get_name()
 
-        with open(audio_path, "rb") as audio_file:
-            params = self.get_transcription_params(model, api_key, base_url)
-            response = await litellm.atranscription(
-                model=f"{provider_prefix}/{model}", file=audio_file, **params
-            )
+        # mmap em vez de ler o arquivo para o heap: as páginas ficam no page
+        # cache do kernel e o upload não duplica o áudio na memória do processo.
+        # open+mmap tocam o disco, então rodam fora do event loop.
+        params = self.get_transcription_params(model, api_key, base_url)
+        audio_file, mapped = await asyncio.to_thread(_open_audio_mapped, audio_path)
+        try:
+            if mapped is not None:
+                with mapped:
+                    response = await litellm.atranscription(
+                        model=f"{provider_prefix}/{model}",
+                        file=(os.path.basename(audio_path), mapped),
+                        **params,
+                    )
+            else:
+                response = await litellm.atranscription(
+                    model=f"{provider_prefix}/{model}", file=audio_file, **params
+                )
+        finally:
+            audio_file.close()
 
         if hasattr(response, "segments") and response.segments:
-            segments = [
+            # Gerador em vez de lista intermediária: o builder consome cada
+            # segmento direto do payload da resposta, numa passada só, sem
+            # materializar milhares de objetos duas vezes.
+            raw_segments = response.segments
+            segments = (
                 TranscriptionSegment(
                     start=seg.get("start", 0), end=seg.get("end", 0), text=seg.get("text", "")
                 )
-                for seg in response.segments
-            ]
+                for seg in raw_segments
+            )
+            if len(raw_segments) > 500:
+                return await asyncio.to_thread(self.create_vtt_from_segments, segments)
             return self.create_vtt_from_segments(segments)
         else:
             text_content = getattr(response, "text", str(response))
@@ -184,13 +667,25 @@ class LiteLLMProvider(TranscriptionProvider):
         api_key: str,
         base_url: str,
         progress_callback: Optional[callable] = None,
+        strict: bool = False,
         **kwargs,
     ) -> str:
-        """Traduz VTT usando LiteLLM (async)."""
+        """Traduz VTT usando LiteLLM (async).
+
+        strict=True opta pelo structured output estrito (mais lento);
+        o padrão é json_object best-effort.
+        """
         if target_language == "original":
             return vtt_content
+        if not vtt_content.strip():
+            return vtt_content
 
-        segments = parse_vtt_segments(vtt_content)
+        # Parse fora do loop para VTTs grandes; abaixo do corte o overhead
+        # do to_thread custa mais que o próprio parse.
+        if len(vtt_content) > 100_000:
+            segments = await asyncio.to_thread(parse_vtt_segments, vtt_content)
+        else:
+            segments = parse_vtt_segments(vtt_content)
         if not segments:
             return vtt_content
 
@@ -202,6 +697,7 @@ class LiteLLMProvider(TranscriptionProvider):
             api_key=api_key,
             base_url=base_url,
             progress_callback=progress_callback,
+            strict=strict,
         )
 
     async def _translate_segments(
@@ -212,14 +708,13 @@ class LiteLLMProvider(TranscriptionProvider):
         api_key: str,
         base_url: str,
         progress_callback: Optional[callable] = None,
+        strict: bool = False,
     ) -> str:
         """Lógica compartilhada de tradução em lotes."""
-        import time
-
         start_total = time.time()
 
-        batches = [segments[i : i + BATCH_SIZE] for i in range(0, len(segments), BATCH_SIZE)]
-        print(f"[DEBUG] Iniciando tradução de {len(segments)} segmentos em {len(batches)} lotes...")
+        batches = self._pack_batches(segments)
+        log.debug("Iniciando tradução de %d segmentos em %d lotes...", len(segments), len(batches))
         translated_all = []
 
         if progress_callback:
@@ -227,74 +722,175 @@ class LiteLLMProvider(TranscriptionProvider):
 
         completed_batches = 0
         total_batches = len(batches)
-        semaphore = asyncio.Semaphore(self.get_concurrency_limit())
+        limiter = self._adaptive_limiter(model)
+        rate_bucket = self._rate_bucket()
+        tpm_bucket = self._tpm_bucket()
+        key_pool = _KeyPool.of(api_key)
+        system_messages = _static_system_messages("translation_system", target_language)
+        user_template = load_prompt("translation_user")
+
+        async def translate_texts(
+            texts: List[str], depth: int = 0, retry_key: bool = True
+        ) -> List[Optional[str]]:
+            """Traduz uma lista de textos, dividindo e repetindo em divergência.
+
+            Quando o modelo devolve menos (ou mais) traduções que o enviado,
+            o lote é partido ao meio e cada metade tenta de novo — só a parte
+            problemática é refeita. depth limita a recursão. Item que falhou
+            em definitivo volta como None: o chamador decide o fallback (e só
+            memoiza os itens que realmente foram traduzidos).
+            """
+            batch_key = key_pool.pick()
+            params = self._cached_translation_params(model, batch_key, base_url, strict)
+            user_prompt = format_prompt(user_template, json_texts=_json_dumps(texts))
+            messages = [*system_messages, {"role": "user", "content": user_prompt}]
+
+            cache_key = None
+            content = None
+            fetched = False
+            if _response_cache:
+                cache_key = _response_cache_key(model, messages, params)
+                content = _response_cache.get(cache_key)
+
+            if content is None:
+                if rate_bucket:
+                    await rate_bucket.acquire()
+                if tpm_bucket:
+                    # Entrada estimada por chars/4 + folga p/ prompt e saída.
+                    await tpm_bucket.acquire(sum(len(t) for t in texts) // 4 + 500)
+                # Teto de saída proporcional à entrada (~2x a estimativa
+                # de tokens, mais o overhead do envelope JSON): evita que
+                # um lote descontrolado consuma o orçamento do modelo.
+                out_budget = sum(len(t) for t in texts) // 2 + 4 * len(texts) + 200
+                transient = (
+                    getattr(litellm, "RateLimitError", ()),
+                    getattr(litellm, "APIConnectionError", ()),
+                )
+                for attempt in range(3):
+                    try:
+                        response = await litellm.acompletion(
+                            model=model, messages=messages, max_tokens=out_budget, **params
+                        )
+                        content = response.choices[0].message.content
+                        break
+                    except Exception as e:
+                        if isinstance(e, getattr(litellm, "RateLimitError", ())):
+                            limiter.on_ratelimit()
+                        # Erro transitório (429/queda de conexão): backoff
+                        # exponencial com jitter antes de tentar de novo, para
+                        # os lotes não martelarem o endpoint em uníssono.
+                        if isinstance(e, transient) and attempt < 2:
+                            log.warning(
+                                "Erro transitório no lote (tentativa %d/3): %s", attempt + 1, e
+                            )
+                            await asyncio.sleep(2 ** attempt + random.random())
+                            continue
+                        log.error("Falha na tradução de um lote: %s", e)
+                        key_pool.penalize(batch_key)
+                        if retry_key:
+                            # Com mais de uma chave no pool, tenta o lote uma
+                            # vez numa chave fora de cooldown antes de desistir.
+                            next_key = key_pool.pick()
+                            if next_key != batch_key:
+                                return await translate_texts(texts, depth, retry_key=False)
+                        return [None] * len(texts)
+                fetched = True
+
+            try:
+                translated_texts = _json_loads(content).get("translations", [])
+            except ValueError as e:
+                # JSON inválido quase sempre é truncamento por max_tokens;
+                # trata igual à contagem divergente: parte o lote e repete.
+                log.error("Resposta de tradução não é JSON válido: %s", e)
+                translated_texts = None
+
+            if translated_texts is not None and len(translated_texts) == len(texts):
+                limiter.on_success()
+                # Só persiste respostas que passaram na validação — cachear
+                # um corpo truncado congelaria o defeito para sempre.
+                if fetched and cache_key:
+                    _response_cache.set(cache_key, content)
+                return translated_texts
+
+            if translated_texts is not None:
+                log.warning(
+                    "Recebeu %d traduções para %d textos.", len(translated_texts), len(texts)
+                )
+            if depth < 2 and len(texts) > 1:
+                mid = len(texts) // 2
+                left, right = await asyncio.gather(
+                    translate_texts(texts[:mid], depth + 1),
+                    translate_texts(texts[mid:], depth + 1),
+                )
+                return left + right
+            return [None] * len(texts)
 
         async def translate_batch(
             batch_idx: int, batch: List[TranscriptionSegment]
-        ) -> List[TranscriptionSegment]:
-            nonlocal completed_batches
+        ) -> tuple:
             texts = [seg.text for seg in batch]
 
-            async with semaphore:
-                batch_start = time.time()
-                print(f"[DEBUG] Iniciando lote {batch_idx+1}/{total_batches} ({len(texts)} textos)")
-                params = self.get_translation_params(model, api_key, base_url)
-
-                # Load prompts from files
-                system_prompt = load_prompt("translation_system")
-                system_prompt = format_prompt(system_prompt, target_language=target_language)
-
-                user_prompt = load_prompt("translation_user")
-                user_prompt = format_prompt(
-                    user_prompt, json_texts=json.dumps(texts, ensure_ascii=False)
-                )
-
-                try:
-                    response = await litellm.acompletion(
-                        model=model,
-                        messages=[
-                            {"role": "system", "content": system_prompt},
-                            {"role": "user", "content": user_prompt},
-                        ],
-                        **params,
+            # Linhas repetidas (já traduzidas neste processo) saem do memo;
+            # só o restante vai para o modelo, preservando a ordem original.
+            keys = [
+                (target_language, model, hashlib.sha1(t.encode()).digest()) for t in texts
+            ]
+            translated_texts: List[Optional[str]] = [
+                t if not _WORD_RE.search(t) else _tx_cache_get(k)
+                for t, k in zip(texts, keys)
+            ]
+            pending = [i for i, t in enumerate(translated_texts) if t is None]
+
+            if pending:
+                pending_texts = [texts[i] for i in pending]
+                async with limiter:
+                    batch_start = time.time()
+                    log.debug(
+                        "Iniciando lote %d/%d (%d textos, %d do memo)",
+                        batch_idx + 1, total_batches, len(texts), len(texts) - len(pending),
                     )
-
+                    fresh = await translate_texts(pending_texts)
                     batch_elapsed = time.time() - batch_start
-                    print(f"[DEBUG] Lote {batch_idx+1} concluído em {batch_elapsed:.2f}s")
-
-                    content = response.choices[0].message.content
-                    parsed = json.loads(content)
-                    translated_texts = parsed.get("translations", [])
-
-                    # Ensure we have the same number of translations
-                    if len(translated_texts) != len(texts):
-                        print(
-                            f"[WARN] Lote {batch_idx+1}: recebeu {len(translated_texts)} traduções para {len(texts)} textos."
-                        )
-
-                except Exception as e:
-                    print(f"[ERROR] Falha no lote {batch_idx+1}: {e}")
-                    translated_texts = texts
-
-                completed_batches += 1
-                if progress_callback:
-                    percentage = int((completed_batches / total_batches) * 100)
-                    await progress_callback(
-                        "translating",
-                        percentage,
-                        f"Translated {completed_batches}/{total_batches} batches",
-                    )
-
-            for i, seg in enumerate(batch):
-                if i < len(translated_texts):
-                    seg.text = translated_texts[i]
-
-            return batch
-
-        tasks = [translate_batch(i, batch) for i, batch in enumerate(batches)]
-        translated_batches = await asyncio.gather(*tasks)
+                    log.debug("Lote %d concluído em %.2fs", batch_idx + 1, batch_elapsed)
+
+                for slot, new_text in zip(pending, fresh):
+                    if new_text is None:
+                        # Falha terminal naquele item: mantém o texto original
+                        # e NÃO memoiza, para não congelar a falha no cache.
+                        translated_texts[slot] = texts[slot]
+                    else:
+                        translated_texts[slot] = new_text
+                        _tx_cache_put(keys[slot], new_text)
+
+            for seg, new_text in zip(batch, translated_texts):
+                seg.text = new_text
+
+            return batch_idx, batch
+
+        # as_completed em vez de gather: o progresso avança conforme cada lote
+        # termina, em vez de todos esperarem o lote mais lento.
+        tasks = [asyncio.ensure_future(translate_batch(i, batch)) for i, batch in enumerate(batches)]
+        results: List[Optional[List[TranscriptionSegment]]] = [None] * total_batches
+        last_emit = 0.0
+        for future in asyncio.as_completed(tasks):
+            batch_idx, translated_batch = await future
+            results[batch_idx] = translated_batch
+            completed_batches += 1
+            # No máximo uma atualização a cada 250ms (a última sempre sai),
+            # para não inundar o stream quando vários lotes terminam juntos.
+            now = time.monotonic()
+            if progress_callback and (
+                now - last_emit >= 0.25 or completed_batches == total_batches
+            ):
+                last_emit = now
+                percentage = int((completed_batches / total_batches) * 100)
+                await progress_callback(
+                    "translating",
+                    percentage,
+                    f"Translated {completed_batches}/{total_batches} batches",
+                )
 
-        for batch in translated_batches:
+        for batch in results:
             translated_all.extend(batch)
 
         total_segments = len(segments)
@@ -304,8 +900,12 @@ class LiteLLMProvider(TranscriptionProvider):
             )
 
         total_elapsed = time.time() - start_total
-        print(f"[DEBUG] Tradução total concluída em {total_elapsed:.2f}s")
+        log.debug("Tradução total concluída em %.2fs", total_elapsed)
 
+        # Montagem é CPU puro; acima de ~500 cues vale tirá-la do event loop
+        # (abaixo disso o overhead do to_thread domina).
+        if len(translated_all) > 500:
+            return await asyncio.to_thread(build_vtt_from_segments, translated_all)
         return build_vtt_from_segments(translated_all)
 
     async def summarize(
@@ -325,24 +925,35 @@ class LiteLLMProvider(TranscriptionProvider):
         2. Extração de momentos-chave (com timestamps)
         Returns dict with 'summary' and 'key_moments' fields.
         """
-        print(f"[DEBUG] Summarize called with target_language: {target_language}, model: {model}")
+        log.debug("Summarize called with target_language: %s, model: %s", target_language, model)
 
         if progress_callback:
             await progress_callback("summarizing", 20, "Starting parallel analysis...")
 
-        summary_task = self._generate_summary(
-            transcript, target_language, model, api_key, base_url, progress_callback
-        )
-        key_moments_task = self._extract_key_moments(
-            transcript, target_language, model, api_key, base_url, progress_callback
-        )
+        # Apara o transcrito uma única vez, no maior dos dois orçamentos: os
+        # dois caminhos partem do mesmo texto (uma só passada do tokenizador
+        # no caso comum) e cada um só refina para o próprio teto.
+        transcript = _trim_to_tokens(transcript, self._analysis_budget())
 
-        summary_result, key_moments_result = await asyncio.gather(summary_task, key_moments_task)
+        async with asyncio.TaskGroup() as tg:
+            summary_task = tg.create_task(
+                self._generate_summary(
+                    transcript, target_language, model, api_key, base_url, progress_callback
+                )
+            )
+            key_moments_task = tg.create_task(
+                self._extract_key_moments(
+                    transcript, target_language, model, api_key, base_url, progress_callback
+                )
+            )
+
+        summary_result = summary_task.result()
+        key_moments_result = key_moments_task.result()
 
         summary_text = summary_result.get("summary", "")
         key_moments = key_moments_result.get("key_moments", [])
 
-        print(f"[DEBUG] Summary generated, key moments: {len(key_moments)}")
+        log.debug("Summary generated, key moments: %d", len(key_moments))
 
         if progress_callback:
             await progress_callback("summarizing", 95, "Summary and key moments ready!")
@@ -364,41 +975,32 @@ class LiteLLMProvider(TranscriptionProvider):
         if progress_callback:
             await progress_callback("summarizing", 30, "Preparing summary prompt...")
 
-        lang_names = {
-            "en": "English",
-            "pt": "Portuguese (Brasil)",
-            "es": "Spanish",
-            "fr": "French",
-            "de": "German",
-            "it": "Italian",
-            "ja": "Japanese",
-            "ko": "Korean",
-            "zh": "Chinese",
-        }
-
-        if target_language == "original":
-            lang_name = "the original language of this text"
-        else:
-            lang_name = lang_names.get(target_language, target_language)
+        lang_name = _resolve_lang_name(target_language)
 
-        system_prompt = load_prompt("summary_system")
-        system_prompt = format_prompt(system_prompt, target_language=lang_name)
+        system_messages = _static_system_messages("summary_system", lang_name)
 
         user_prompt = load_prompt("summary_user")
         user_prompt = format_prompt(
-            user_prompt, target_language=lang_name, transcript=transcript[:15000]
+            user_prompt,
+            target_language=lang_name,
+            transcript=_trim_to_tokens(transcript, self._analysis_budget()),
         )
 
         if progress_callback:
             await progress_callback("summarizing", 40, "Sending summary request to AI...")
 
+        messages = [*system_messages, {"role": "user", "content": user_prompt}]
+        cache_key = None
+        if _response_cache:
+            cache_key = _response_cache_key(f"{provider_prefix}/{model}", messages, {})
+            cached = _response_cache.get(cache_key)
+            if cached:
+                return {"summary": cached}
+
         try:
             response = await litellm.acompletion(
                 model=f"{provider_prefix}/{model}",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
+                messages=messages,
                 api_key=api_key,
                 timeout=self.get_timeout(),
                 reasoning_effort=None,
@@ -408,15 +1010,17 @@ class LiteLLMProvider(TranscriptionProvider):
                 await progress_callback("summarizing", 80, "Processing AI response...")
 
             content = response.choices[0].message.content
-            print(f"[DEBUG] Summary response: {content[:100] if content else '(empty)'}...")
+            log.debug("Summary response: %.100s...", content or "(empty)")
 
             if not content:
                 return {"summary": "No summary generated"}
 
+            if cache_key:
+                _response_cache.set(cache_key, content)
             return {"summary": content}
 
         except Exception as e:
-            print(f"[ERROR] Summary generation failed: {e}")
+            log.error("Summary generation failed: %s", e)
             return {"summary": f"Error: {e}"}
 
     async def _extract_key_moments(
@@ -434,65 +1038,62 @@ class LiteLLMProvider(TranscriptionProvider):
         if progress_callback:
             await progress_callback("summarizing", 35, "Preparing key moments prompt...")
 
-        lang_names = {
-            "en": "English",
-            "pt": "Portuguese (Brasil)",
-            "es": "Spanish",
-            "fr": "French",
-            "de": "German",
-            "it": "Italian",
-            "ja": "Japanese",
-            "ko": "Korean",
-            "zh": "Chinese",
-        }
+        lang_name = _resolve_lang_name(target_language)
 
-        if target_language == "original":
-            lang_name = "the original language of this text"
-        else:
-            lang_name = lang_names.get(target_language, target_language)
-
-        system_prompt = load_prompt("key_moments_system")
-        system_prompt = format_prompt(system_prompt, target_language=lang_name)
+        system_messages = _static_system_messages("key_moments_system", lang_name)
 
         user_prompt = (
-            f"Extract key moments from this transcript with timestamps:\n\n{transcript[:20000]}"
+            "Extract key moments from this transcript with timestamps:\n\n"
+            f"{_trim_to_tokens(transcript, self._analysis_budget())}"
         )
 
         if progress_callback:
             await progress_callback("summarizing", 45, "Fetching key moments from AI...")
 
-        try:
-            response = await litellm.acompletion(
-                model=f"{provider_prefix}/{model}",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_prompt},
-                ],
-                api_key=api_key,
-                timeout=self.get_timeout(),
-                reasoning_effort=None,
-                response_format={"type": "json_object"},
+        messages = [*system_messages, {"role": "user", "content": user_prompt}]
+        cache_key = None
+        content = None
+        if _response_cache:
+            cache_key = _response_cache_key(
+                f"{provider_prefix}/{model}", messages, {"response_format": "json_object"}
             )
+            content = _response_cache.get(cache_key)
+
+        try:
+            fetched = False
+            if content is None:
+                response = await litellm.acompletion(
+                    model=f"{provider_prefix}/{model}",
+                    messages=messages,
+                    api_key=api_key,
+                    timeout=self.get_timeout(),
+                    reasoning_effort=None,
+                    response_format={"type": "json_object"},
+                )
+                content = response.choices[0].message.content
+                fetched = True
 
             if progress_callback:
                 await progress_callback("summarizing", 85, "Parsing key moments...")
-
-            content = response.choices[0].message.content
-            print(f"[DEBUG] Key moments response: {content[:100] if content else '(empty)'}...")
+            log.debug("Key moments response: %.100s...", content or "(empty)")
 
             if not content:
                 return {"key_moments": []}
 
-            data = json.loads(content)
+            data = _json_loads(content)
+            # Só persiste depois do parse: cachear um corpo inválido serviria
+            # o defeito para toda requisição seguinte até o TTL de 30 dias.
+            if fetched and cache_key:
+                _response_cache.set(cache_key, content)
             key_moments = data.get("key_moments", [])
             return {"key_moments": key_moments}
 
-        except json.JSONDecodeError as err:
-            print(f"[WARN] Failed to parse key moments as JSON: {err}")
-            print(f"[WARN] Raw content: {content[:200] if content else '(empty)'}")
+        except ValueError as err:
+            log.warning("Failed to parse key moments as JSON: %s", err)
+            log.warning("Raw content: %.200s", content or "(empty)")
             return {"key_moments": []}
         except Exception as e:
-            print(f"[ERROR] Key moments extraction failed: {e}")
+            log.error("Key moments extraction failed: %s", e)
             return {"key_moments": []}
 
     async def extract_key_moments(
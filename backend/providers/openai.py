@@ -13,8 +13,10 @@ class OpenAIProvider(LiteLLMProvider):
         return "openai"
 
     def use_structured_output(self, model: str = None) -> bool:
-        """OpenAI suporta structured output."""
-        return True
+        """Best-effort (json_object) por padrão: strict compila gramática por
+        requisição e custa latência/tokens por segundo. Strict continua
+        disponível por chamada via translate(strict=True)."""
+        return False
 
     def get_transcription_params(self, model: str, api_key: str, base_url: str) -> dict:
         """Adiciona parametros especificos do OpenAI para transcricao."""
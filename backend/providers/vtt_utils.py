@@ -3,7 +3,6 @@ Utilidades compartilhadas para parsing e formatação de VTT (WebVTT).
 Usado por todos os providers de transcrição.
 """
 
-import re
 from typing import List
 from .base import TranscriptionSegment
 
@@ -18,28 +17,38 @@ def parse_vtt_segments(vtt_content: str) -> List[TranscriptionSegment]:
     Returns:
         List of TranscriptionSegment objects with start, end, and text
     """
-    lines = vtt_content.strip().split("\n")
+    # splitlines lida com \r\n sem alocar um strip() do conteúdo inteiro;
+    # cada linha é strip-ada uma única vez, num local.
+    lines = vtt_content.splitlines()
     segments = []
     current_segment = None
-
-    time_pattern = re.compile(r"(\d{2}:)?\d{2}:\d{2}\.\d{3}\s*-->\s*(\d{2}:)?\d{2}:\d{2}\.\d{3}")
+    # Linhas de texto acumulam numa lista e viram string num join só no
+    # fechamento do cue: += no campo text é quadrático para cues longos.
+    current_lines: List[str] = []
 
     for line in lines:
         line = line.strip()
         if not line or line == "WEBVTT":
             continue
 
-        if time_pattern.search(line):
+        # "-->" só aparece na linha de tempos de um cue; o teste de substring
+        # (C puro, sem alocação) substitui a regex que rodava em toda linha
+        # de texto — o caminho mais quente do parser. Linhas malformadas
+        # falham naturalmente no int()/float() de parse_vtt_time.
+        if "-->" in line:
             if current_segment:
+                current_segment.text = "\n".join(current_lines)
                 segments.append(current_segment)
-            times = line.split("-->")
+                current_lines = []
+            times = line.split("-->", 1)
             start = parse_vtt_time(times[0].strip())
             end = parse_vtt_time(times[1].strip())
             current_segment = TranscriptionSegment(start=start, end=end, text="")
         elif current_segment is not None:
-            current_segment.text += ("\n" if current_segment.text else "") + line
+            current_lines.append(line)
 
     if current_segment:
+        current_segment.text = "\n".join(current_lines)
         segments.append(current_segment)
 
     return segments
@@ -59,8 +68,23 @@ def parse_vtt_time(time_str: str) -> float:
     Returns:
         Time in seconds as float
     """
+    # Despacho por comprimento + fatias indexadas: os dois formatos canônicos
+    # têm largura fixa, então dá para ler cada campo sem alocar a lista do
+    # split. A soma é feita em milissegundos inteiros e dividida uma vez,
+    # o que também evita erro de arredondamento acumulado.
+    n = len(time_str)
+    if n == 12:  # HH:MM:SS.mmm
+        ms = (
+            int(time_str[0:2]) * 3600 + int(time_str[3:5]) * 60 + int(time_str[6:8])
+        ) * 1000 + int(time_str[9:12])
+        return ms / 1000.0
+    if n == 9:  # MM:SS.mmm
+        ms = (int(time_str[0:2]) * 60 + int(time_str[3:5])) * 1000 + int(time_str[6:9])
+        return ms / 1000.0
+
+    # Larguras fora do padrão (ex.: horas com 1 dígito): caminho genérico.
     parts = time_str.split(":")
-    seconds = 0
+    seconds = 0.0
     if len(parts) == 3:
         seconds += int(parts[0]) * 3600
         seconds += int(parts[1]) * 60
@@ -81,10 +105,13 @@ def format_vtt_time(seconds: float) -> str:
     Returns:
         VTT formatted timestamp (e.g., "00:01:23.456")
     """
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = seconds % 60
-    return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+    # Aritmética inteira em milissegundos: sem módulo de float (lento e
+    # sujeito a arredondamento acumulado) nem o caminho de formatação %.3f.
+    ms = int(round(seconds * 1000))
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}.{ms:03d}"
 
 
 def build_vtt_from_segments(segments: List[TranscriptionSegment]) -> str:
@@ -97,10 +124,12 @@ def build_vtt_from_segments(segments: List[TranscriptionSegment]) -> str:
     Returns:
         WebVTT formatted string
     """
-    vtt = "WEBVTT\n\n"
+    # Lista + join em vez de += : montagem linear no total de bytes,
+    # em vez de quadrática, para VTTs com milhares de cues.
+    parts = ["WEBVTT\n\n"]
+    append = parts.append
+    fmt = format_vtt_time
+    tmpl = "%s --> %s\n%s\n\n"
     for seg in segments:
-        start = format_vtt_time(seg.start)
-        end = format_vtt_time(seg.end)
-        text = seg.text.strip()
-        vtt += f"{start} --> {end}\n{text}\n\n"
-    return vtt
+        append(tmpl % (fmt(seg.start), fmt(seg.end), seg.text.strip()))
+    return "".join(parts)
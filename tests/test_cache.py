@@ -47,4 +47,86 @@ class TestCache:
         }
         assert len(summary_cache) == 2
         assert summary_cache[f"{video_id}_en"]["summary"] == "English summary"
-        assert summary_cache[f"{video_id}_pt"]["summary"] == "Resumo em português"
\ No newline at end of file
+        assert summary_cache[f"{video_id}_pt"]["summary"] == "Resumo em português"
+
+class TestSQLiteCacheStore:
+    def test_round_trip(self, tmp_path):
+        """Test entries survive a set/load round trip."""
+        from cache import SQLiteCacheStore
+        store = SQLiteCacheStore(str(tmp_path / "cache.db"))
+        store.set("subtitles", "vid_en", {"vtt": "WEBVTT", "language": "en"})
+        entries = store.load("subtitles", max_age_seconds=3600)
+        assert entries["vid_en"]["vtt"] == "WEBVTT"
+        assert entries["vid_en"]["language"] == "en"
+        store.close()
+
+    def test_load_skips_expired_entries(self, tmp_path):
+        """Test load ignores entries older than max_age_seconds."""
+        from cache import SQLiteCacheStore
+        store = SQLiteCacheStore(str(tmp_path / "cache.db"))
+        store.set("subtitles", "vid_old", {"vtt": "WEBVTT"})
+        # Negative max age puts the cutoff in the future, expiring everything
+        assert store.load("subtitles", max_age_seconds=-1) == {}
+        store.close()
+
+    def test_delete(self, tmp_path):
+        """Test deleted entries no longer load."""
+        from cache import SQLiteCacheStore
+        store = SQLiteCacheStore(str(tmp_path / "cache.db"))
+        store.set("subtitles", "vid_del", {"vtt": "WEBVTT"})
+        store.delete("subtitles", "vid_del")
+        assert store.load("subtitles", max_age_seconds=3600) == {}
+        store.close()
+
+
+class TestResponseCache:
+    def test_round_trip(self, tmp_path):
+        """Test responses survive a set/get round trip."""
+        from cache import ResponseCache
+        cache = ResponseCache(str(tmp_path / "responses.db"))
+        cache.set("abc", '{"translations": ["ok"]}')
+        assert cache.get("abc") == '{"translations": ["ok"]}'
+        cache.close()
+
+    def test_expired_entry_is_dropped(self, tmp_path):
+        """Test entries past the TTL return None."""
+        import time
+        from cache import ResponseCache
+        cache = ResponseCache(str(tmp_path / "responses.db"), ttl_seconds=0.0)
+        cache.set("abc", "stale")
+        time.sleep(0.01)
+        assert cache.get("abc") is None
+        cache.close()
+
+
+class TestSubtitleCacheEviction:
+    def test_lru_eviction_respects_max_size(self):
+        """Test oldest entries are evicted once the cache exceeds the cap."""
+        from main import set_cached_subtitle
+        try:
+            with patch("main.CACHE_MAX_SIZE", 2):
+                set_cached_subtitle("evict_a", "WEBVTT\n\nA")
+                set_cached_subtitle("evict_b", "WEBVTT\n\nB")
+                set_cached_subtitle("evict_c", "WEBVTT\n\nC")
+            assert "evict_a_original" not in subtitle_cache
+            assert "evict_b_original" in subtitle_cache
+            assert "evict_c_original" in subtitle_cache
+            assert len(subtitle_cache) == 2
+        finally:
+            subtitle_cache.clear()
+
+    def test_cleanup_removes_expired_entries(self):
+        """Test the heap sweep drops entries older than the TTL."""
+        import heapq
+        import time
+        from main import set_cached_subtitle, cleanup_expired_cache, _subtitle_expiry_heap, _TTL
+        set_cached_subtitle("expired_vid", "WEBVTT\n\nX")
+        cache_key = "expired_vid_original"
+        try:
+            subtitle_cache[cache_key]["cached_at"] = time.monotonic() - _TTL - 1
+            heapq.heappush(_subtitle_expiry_heap, (0.0, cache_key))
+            removed = cleanup_expired_cache()
+            assert removed >= 1
+            assert cache_key not in subtitle_cache
+        finally:
+            subtitle_cache.pop(cache_key, None)
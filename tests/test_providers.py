@@ -58,4 +58,54 @@ class TestOpenAIProvider:
         provider = OpenAIProvider()
         result = await provider.transcribe("dummy_audio", "whisper-1", "test_key", "")
         assert "WEBVTT" in result
-        assert "Test" in result
\ No newline at end of file
+        assert "Test" in result
+
+def _completion_response(content):
+    return MagicMock(choices=[MagicMock(message=MagicMock(content=content))])
+
+
+class TestTranslateRecovery:
+    @pytest.mark.asyncio
+    @patch('backend.providers.litellm_base.litellm.acompletion')
+    async def test_translate_splits_on_count_mismatch(self, mock_completion):
+        """Test a short reply triggers split-and-retry instead of dropping texts."""
+        def fake_completion(*args, **kwargs):
+            user_prompt = kwargs["messages"][-1]["content"]
+            if "Alpha" in user_prompt and "Beta" in user_prompt:
+                # Wrong count for the full batch: forces the split
+                return _completion_response('{"translations": ["Alfa"]}')
+            if "Alpha" in user_prompt:
+                return _completion_response('{"translations": ["Alfa"]}')
+            return _completion_response('{"translations": ["Beta traduzido"]}')
+
+        mock_completion.side_effect = fake_completion
+
+        provider = GroqProvider()
+        vtt = (
+            "WEBVTT\n\n"
+            "00:00:01.000 --> 00:00:05.000\nAlpha\n\n"
+            "00:00:05.000 --> 00:00:10.000\nBeta\n"
+        )
+        result = await provider.translate(vtt, "pt", "gpt-4o-mini", "test_key", "")
+        assert "Alfa" in result
+        assert "Beta traduzido" in result
+        # One mismatched batch call plus one retry per half
+        assert mock_completion.call_count == 3
+
+    @pytest.mark.asyncio
+    @patch('backend.providers.litellm_base.litellm.acompletion')
+    async def test_failed_batch_falls_back_and_is_not_memoized(self, mock_completion):
+        """Test a failed batch keeps the source text without poisoning the memo."""
+        mock_completion.side_effect = RuntimeError("boom")
+
+        provider = GroqProvider()
+        vtt = "WEBVTT\n\n00:00:01.000 --> 00:00:05.000\nGamma\n"
+        result = await provider.translate(vtt, "pt", "gpt-4o-mini", "test_key", "")
+        assert "Gamma" in result
+
+        # The fallback must not be cached as a translation: a later attempt
+        # with a healthy endpoint goes back to the model and succeeds.
+        mock_completion.side_effect = None
+        mock_completion.return_value = _completion_response('{"translations": ["Gama"]}')
+        result = await provider.translate(vtt, "pt", "gpt-4o-mini", "test_key", "")
+        assert "Gama" in result
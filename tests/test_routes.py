@@ -82,4 +82,28 @@ def test_cache_delete_endpoint():
     response = client.delete("/cache")
     assert response.status_code == 200
     data = response.json()
-    assert "removed_count" in data
\ No newline at end of file
+    assert "removed_count" in data
+
+def test_subtitles_endpoint_not_cached():
+    """Test subtitles endpoint returns 404 for unknown videos."""
+    response = client.get("/subtitles/missing_video")
+    assert response.status_code == 404
+
+
+def test_subtitles_endpoint_etag_flow():
+    """Test subtitles endpoint serves cached VTT with ETag and honors If-None-Match."""
+    from main import set_cached_subtitle, subtitle_cache
+    set_cached_subtitle("etag_video", "WEBVTT\n\n00:00:01.000 --> 00:00:05.000\nHello")
+    try:
+        response = client.get("/subtitles/etag_video")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["vtt"].startswith("WEBVTT")
+        assert data["cached"] is True
+        etag = response.headers["ETag"]
+
+        conditional = client.get("/subtitles/etag_video", headers={"If-None-Match": etag})
+        assert conditional.status_code == 304
+        assert conditional.headers["ETag"] == etag
+    finally:
+        subtitle_cache.pop("etag_video_original", None)